@@ -0,0 +1,27 @@
+"""stand search indexes
+
+Revision ID: 202610190002
+Revises: 202610190001
+Create Date: 2026-10-19 00:02:00.000000
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "202610190002"
+down_revision = "202610190001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_stands_project_status_price", "stands", ["project_id", "status", "price"])
+    op.create_index("ix_stands_status_price", "stands", ["status", "price"])
+    op.create_index("ix_stands_size_m2", "stands", ["size_m2"])
+
+
+def downgrade():
+    op.drop_index("ix_stands_size_m2", table_name="stands")
+    op.drop_index("ix_stands_status_price", table_name="stands")
+    op.drop_index("ix_stands_project_status_price", table_name="stands")
@@ -0,0 +1,32 @@
+"""stand plot geometry
+
+Revision ID: 202610190003
+Revises: 202610190002
+Create Date: 2026-10-19 00:03:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "202610190003"
+down_revision = "202610190002"
+branch_labels = None
+depends_on = None
+
+BBOX_COLUMNS = ["centroid_x", "centroid_y", "min_x", "min_y", "max_x", "max_y"]
+
+
+def upgrade():
+    op.add_column("stands", sa.Column("geometry", sa.JSON(), nullable=True))
+    for name in BBOX_COLUMNS:
+        op.add_column("stands", sa.Column(name, sa.Float(), nullable=True))
+    op.execute("CREATE INDEX ix_stands_bbox ON stands USING gist (box(point(min_x, min_y), point(max_x, max_y)))")
+
+
+def downgrade():
+    op.drop_index("ix_stands_bbox", table_name="stands")
+    for name in reversed(BBOX_COLUMNS):
+        op.drop_column("stands", name)
+    op.drop_column("stands", "geometry")
@@ -0,0 +1,51 @@
+"""daily reservation and sales rollups
+
+Revision ID: 202610190004
+Revises: 202610190003
+Create Date: 2026-10-19 00:04:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "202610190004"
+down_revision = "202610190003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "reservation_daily_rollups",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("project_id", sa.Integer(), primary_key=True),
+        sa.Column("realtor_id", sa.Integer(), primary_key=True),
+        sa.Column("created", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("approved", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("rejected", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("expired", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("converted", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("converted_value", sa.Numeric(), nullable=False, server_default="0"),
+    )
+    op.create_table(
+        "sales_daily_rollups",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("project_id", sa.Integer(), primary_key=True),
+        sa.Column("sales_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("sales_value", sa.Numeric(), nullable=False, server_default="0"),
+    )
+    op.create_index("ix_reservations_stand_id", "reservations", ["stand_id"])
+    op.create_index("ix_reservations_date_realtor", "reservations", ["reservation_date", "realtor_id"])
+    op.create_index("ix_sales_stand_id", "sales", ["stand_id"])
+    op.create_index("ix_sales_sale_date", "sales", ["sale_date"])
+
+
+def downgrade():
+    op.drop_index("ix_sales_sale_date", table_name="sales")
+    op.drop_index("ix_sales_stand_id", table_name="sales")
+    op.drop_index("ix_reservations_date_realtor", table_name="reservations")
+    op.drop_index("ix_reservations_stand_id", table_name="reservations")
+    op.drop_table("sales_daily_rollups")
+    op.drop_table("reservation_daily_rollups")
@@ -0,0 +1,42 @@
+"""background jobs
+
+Revision ID: 202610190005
+Revises: 202610190004
+Create Date: 2026-10-19 00:05:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "202610190005"
+down_revision = "202610190004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("job_type", sa.String(), nullable=False),
+        sa.Column("params", sa.JSON(), nullable=True),
+        sa.Column("status", sa.Enum("PENDING", "RUNNING", "SUCCEEDED", "FAILED", "CANCELLED", name="jobstatus"), nullable=False, server_default="PENDING"),
+        sa.Column("progress", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("message", sa.String(), nullable=True),
+        sa.Column("cancel_requested", sa.Boolean(), nullable=False, server_default=sa.text("false")),
+        sa.Column("result_path", sa.String(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_by", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_jobs_status_type", "jobs", ["status", "job_type"])
+
+
+def downgrade():
+    op.drop_index("ix_jobs_status_type", table_name="jobs")
+    op.drop_table("jobs")
+    op.execute("DROP TYPE IF EXISTS jobstatus")
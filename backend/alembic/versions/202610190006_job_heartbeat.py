@@ -0,0 +1,26 @@
+"""job worker heartbeat
+
+Revision ID: 202610190006
+Revises: 202610190005
+Create Date: 2026-10-19 00:06:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "202610190006"
+down_revision = "202610190005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("jobs", sa.Column("worker_id", sa.String(), nullable=True))
+    op.add_column("jobs", sa.Column("heartbeat_at", sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("jobs", "heartbeat_at")
+    op.drop_column("jobs", "worker_id")
@@ -0,0 +1,58 @@
+import numpy as np
+from sqlalchemy import Float, String, and_, cast, func, select, type_coerce
+from sqlalchemy.orm import Session
+
+from .core.cache import cache
+from .models import entities
+
+
+def invalidate_project_analytics(*project_ids: int) -> None:
+    cache.invalidate(*[f"analytics:{project_id}:*" for project_id in project_ids])
+
+
+def project_analytics(db: Session, project_id: int, bins: int) -> dict:
+    return cache.get_or_load(f"analytics:{project_id}:{bins}", lambda: _compute(db, project_id, bins))
+
+
+def _compute(db: Session, project_id: int, bins: int) -> dict:
+    rows = db.execute(
+        # Plain float/str columns skip per-row Decimal and Enum construction.
+        select(
+            cast(entities.Stand.price, Float),
+            cast(entities.Stand.size_m2, Float),
+            type_coerce(entities.Stand.status, String),
+            cast(func.coalesce(entities.Sale.sale_price, entities.Stand.price), Float),
+        )
+        .outerjoin(
+            entities.Sale,
+            and_(entities.Sale.stand_id == entities.Stand.id, entities.Sale.status != entities.SaleStatus.CANCELLED),
+        )
+        .where(entities.Stand.project_id == project_id)
+    ).all()
+    price, size, status, realised = zip(*rows) if rows else ((), (), (), ())
+    price = np.array(price, dtype=float)
+    size = np.array(size, dtype=float)
+    status = np.array(status, dtype=str)
+    realised = np.array(realised, dtype=float)
+
+    sold = status == entities.StandStatus.SOLD.value
+    # Sold stands are valued at their sale price everywhere, unsold ones at list price.
+    value = np.where(sold, realised, price)
+    per_m2 = price[size > 0] / size[size > 0]
+    result = {
+        "project_id": project_id,
+        "stand_count": len(rows),
+        "price_per_m2": None,
+        "histogram": [],
+        "sold_value": float(value[sold].sum()),
+        "remaining_value": float(value[~sold].sum()),
+        "value_by_status": {option.value: float(value[status == option.value].sum()) for option in entities.StandStatus},
+    }
+    if per_m2.size:
+        low, median, p90, high = np.percentile(per_m2, [0, 50, 90, 100])
+        counts, edges = np.histogram(per_m2, bins=bins)
+        result["price_per_m2"] = {"min": float(low), "median": float(median), "p90": float(p90), "max": float(high)}
+        result["histogram"] = [
+            {"min": float(edges[i]), "max": float(edges[i + 1]), "count": int(counts[i])} for i in range(len(counts))
+        ]
+    return result
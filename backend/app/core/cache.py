@@ -0,0 +1,211 @@
+import json
+import logging
+import os
+import pickle
+import select
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Callable, Optional, Protocol, Tuple
+
+from sqlalchemy import func
+from sqlalchemy import select as sql_select
+
+from .config import get_settings
+from ..database import engine
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Any:
+        """Return the cached value or ``MISSING``."""
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        ...
+
+    def delete(self, key: str) -> None:
+        """Delete ``key``, or every key starting with it when it ends in ``*``."""
+
+
+class LocalCacheBackend:
+    """In-process LRU with per-entry TTL."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.evictions = 0
+        self._items: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return MISSING
+            if item[0] <= time.monotonic():
+                del self._items[key]
+                return MISSING
+            self._items.move_to_end(key)
+            return item[1]
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._items[key] = (time.monotonic() + ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key.endswith("*"):
+                for existing in [existing for existing in self._items if existing.startswith(key[:-1])]:
+                    del self._items[existing]
+            else:
+                self._items.pop(key, None)
+
+
+class RedisCacheBackend:
+    def __init__(self, url: str):
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self.evictions = 0
+
+    def get(self, key: str) -> Any:
+        value = self._client.get(f"cache:{key}")
+        return MISSING if value is None else pickle.loads(value)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._client.set(f"cache:{key}", pickle.dumps(value), px=int(ttl * 1000))
+
+    def delete(self, key: str) -> None:
+        if key.endswith("*"):
+            keys = list(self._client.scan_iter(match=f"cache:{key}"))
+            if keys:
+                self._client.delete(*keys)
+        else:
+            self._client.delete(f"cache:{key}")
+
+
+class Cache:
+    """Read-through cache whose invalidations are broadcast to every worker over Postgres NOTIFY."""
+
+    def __init__(self, backend: CacheBackend, channel: str):
+        self.backend = backend
+        self.channel = channel
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.hits = 0
+        self.misses = 0
+        self.invalidations_sent = 0
+        self.invalidations_received = 0
+        self.invalidations_failed = 0
+        self.lag_ms: deque = deque(maxlen=1000)
+        self._version = 0
+        self._listener: Optional[threading.Thread] = None
+
+    def get_or_load(self, key: str, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        value = self.backend.get(key)
+        if value is not MISSING:
+            self.hits += 1
+            return value
+        self.misses += 1
+        version = self._version
+        value = loader()
+        # Skip storing when anything was invalidated mid-load; the value may predate that write.
+        if value is not None and version == self._version:
+            self.backend.set(key, value, ttl or settings.cache_default_ttl_seconds)
+        return value
+
+    def invalidate(self, *keys: str) -> None:
+        """Drop ``keys`` here and ask every other worker to drop them. Call after the write commits."""
+        self._drop(keys)
+        if engine.dialect.name != "postgresql":
+            return
+        payload = json.dumps({"keys": list(keys), "sent": time.time(), "origin": self.worker_id})
+        try:
+            with engine.connect() as connection:
+                connection.execute(sql_select(func.pg_notify(self.channel, payload)))
+                connection.commit()
+        except Exception:
+            # The write has already committed; other workers fall back to the TTL rather than failing the request.
+            self.invalidations_failed += 1
+            logger.exception("Failed to broadcast cache invalidation for %s", keys)
+            return
+        self.invalidations_sent += 1
+
+    def _drop(self, keys) -> None:
+        self._version += 1
+        for key in keys:
+            self.backend.delete(key)
+
+    def _on_notify(self, payload: str) -> None:
+        message = json.loads(payload)
+        self.invalidations_received += 1
+        self.lag_ms.append((time.time() - message["sent"]) * 1000)
+        if message["origin"] != self.worker_id:
+            self._drop(message["keys"])
+
+    def start_listener(self) -> None:
+        if engine.dialect.name != "postgresql" or self._listener is not None:
+            return
+        self._listener = threading.Thread(target=self._listen, name="cache-invalidation", daemon=True)
+        self._listener.start()
+
+    def _listen(self) -> None:
+        while True:
+            connection = None
+            try:
+                raw = engine.raw_connection()
+                raw.detach()
+                connection = raw.driver_connection
+                connection.autocommit = True
+                connection.cursor().execute(f"LISTEN {self.channel}")
+                while True:
+                    if select.select([connection], [], [], 5) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        self._on_notify(connection.notifies.pop(0).payload)
+            except Exception:
+                logger.exception("Cache invalidation listener failed; reconnecting")
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+                time.sleep(1)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        lag = sorted(self.lag_ms)
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else None,
+            "evictions": self.backend.evictions,
+            "invalidations_sent": self.invalidations_sent,
+            "invalidations_received": self.invalidations_received,
+            "invalidations_failed": self.invalidations_failed,
+            "invalidation_lag_ms": {
+                "p50": lag[len(lag) // 2] if lag else None,
+                "max": lag[-1] if lag else None,
+            },
+            "listening": self._listener is not None and self._listener.is_alive(),
+        }
+
+
+def build_cache() -> Cache:
+    if settings.cache_backend_url:
+        backend = RedisCacheBackend(settings.cache_backend_url)
+    else:
+        backend = LocalCacheBackend(settings.cache_size)
+    return Cache(backend, settings.cache_invalidation_channel)
+
+
+cache = build_cache()
@@ -0,0 +1,178 @@
+import zlib
+from typing import Dict, Optional, Type
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+from .config import get_settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+settings = get_settings()
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/geo+json", "application/javascript", "application/xml")
+
+
+class GzipEncoder:
+    def __init__(self):
+        self._compressor = zlib.compressobj(settings.compression_gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=settings.compression_brotli_quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdEncoder:
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(level=settings.compression_zstd_level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+encoders: Dict[str, Type] = {"gzip": GzipEncoder}
+if brotli is not None:
+    encoders["br"] = BrotliEncoder
+if zstandard is not None:
+    encoders["zstd"] = ZstdEncoder
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Pick the available encoding with the highest q-value, ties going to ``compression_encodings`` order."""
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name] = weight
+    candidates = [
+        (weights.get(name, weights.get("*", 0.0)), -rank, name)
+        for rank, name in enumerate(settings.compression_encodings)
+        if name in encoders
+    ]
+    best = max(candidates, default=None)
+    return best[2] if best is not None and best[0] > 0 else None
+
+
+def _compressible(headers: Headers) -> bool:
+    return "content-encoding" not in headers and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """Compresses compressible responses above ``compression_minimum_size`` with the client's preferred encoding."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(send, encoding))
+
+
+class _CompressingSend:
+    def __init__(self, send, encoding: str):
+        self.send = send
+        self.encoding = encoding
+        self.start: Optional[dict] = None
+        self.passthrough = False
+        self.encoder = None
+        self.buffer = b""
+
+    async def __call__(self, message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            self.passthrough = not _compressible(Headers(raw=message.get("headers", [])))
+            if self.passthrough:
+                await self.send(message)
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+        body, more_body = message.get("body", b""), message.get("more_body", False)
+        if self.encoder is None:
+            # Hold back streamed chunks until we know the body is worth compressing.
+            self.buffer += body
+            if more_body and len(self.buffer) < settings.compression_minimum_size:
+                return
+            body, self.buffer = self.buffer, b""
+            if len(body) < settings.compression_minimum_size:
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            self.encoder = encoders[self.encoding]()
+            if not more_body:
+                payload = await self._compress(body, False)
+                await self.send(self._start_message(len(payload)))
+                await self.send({"type": "http.response.body", "body": payload})
+                return
+            await self.send(self._start_message(None))
+        payload = await self._compress(body, more_body)
+        await self.send({"type": "http.response.body", "body": payload, "more_body": more_body})
+
+    def _start_message(self, content_length: Optional[int]) -> dict:
+        headers = MutableHeaders(raw=list(self.start.get("headers", [])))
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if content_length is None:
+            if "content-length" in headers:
+                del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        return {**self.start, "headers": headers.raw}
+
+    async def _compress(self, body: bytes, more_body: bool) -> bytes:
+        # Large chunks go to the threadpool so compression never stalls other requests on the event loop.
+        if len(body) >= settings.compression_offload_bytes:
+            return await run_in_threadpool(self._encode, body, more_body)
+        return self._encode(body, more_body)
+
+    def _encode(self, body: bytes, more_body: bool) -> bytes:
+        return self.encoder.compress(body) + (self.encoder.flush() if more_body else self.encoder.finish())
@@ -1,4 +1,6 @@
 import os
+from typing import Dict, List, Optional
+
 from pydantic import BaseSettings, Field
 
 
@@ -9,6 +11,45 @@ class Settings(BaseSettings):
     algorithm: str = "HS256"
     database_url: str = Field(default="postgresql+psycopg2://postgres:postgres@db:5432/stands")
     env: str = Field(default="local")
+    idempotency_ttl_seconds: int = 60 * 60 * 24
+    idempotency_lock_seconds: int = 60
+    idempotency_wait_seconds: float = 10.0
+    idempotency_cache_size: int = 1024
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    max_concurrent_requests: int = 12
+    rate_limit_default: str = "120/60"
+    rate_limits: Dict[str, str] = {
+        "POST /api/auth/token": "10/60",
+        "GET /api/stands": "60/60",
+    }
+    rate_limit_backend_url: Optional[str] = None
+    trust_forwarded_for: bool = False
+    map_polygon_min_zoom: int = 15
+    slow_query_threshold_ms: float = 200.0
+    explain_threshold_ms: float = 500.0
+    slow_query_log_size: int = 200
+    profile_interval_seconds: float = 0.001
+    profile_store_size: int = 20
+    cache_backend_url: Optional[str] = None
+    cache_size: int = 4096
+    cache_default_ttl_seconds: float = 300.0
+    user_cache_ttl_seconds: float = 60.0
+    cache_invalidation_channel: str = "cache_invalidation"
+    job_database_url: Optional[str] = None
+    job_workers: int = 2
+    job_type_limits: Dict[str, int] = {"ledger_export": 1, "arrears_report": 1, "client_statements": 1}
+    job_poll_seconds: float = 5.0
+    job_results_dir: str = "job_results"
+    job_stale_seconds: float = 120.0
+    statement_processes: Optional[int] = None
+    statement_chunk_size: int = 500
+    compression_minimum_size: int = 1024
+    compression_encodings: List[str] = ["zstd", "br", "gzip"]
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    compression_zstd_level: int = 3
+    compression_offload_bytes: int = 64 * 1024
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,231 @@
+import asyncio
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+
+from .config import get_settings
+from ..database import SessionLocal
+from ..models import entities
+
+settings = get_settings()
+
+PURGE_EVERY = 100
+
+
+@dataclass
+class StoredResponse:
+    request_hash: str
+    status_code: int
+    content_type: Optional[str]
+    body: bytes
+    expires_at: datetime
+
+
+class LRUCache:
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items: "OrderedDict[str, StoredResponse]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[StoredResponse]:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        if item.expires_at <= datetime.utcnow():
+            del self._items[key]
+            return None
+        self._items.move_to_end(key)
+        return item
+
+    def put(self, key: str, item: StoredResponse) -> None:
+        self._items[key] = item
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+
+def _claim(key: str, request_hash: str) -> tuple[str, Optional[StoredResponse]]:
+    now = datetime.utcnow()
+    with SessionLocal() as db:
+        record = db.get(entities.IdempotencyRecord, key)
+        if record is not None and record.expires_at > now:
+            if record.status_code is None:
+                return "pending", None
+            return "done", StoredResponse(
+                request_hash=record.request_hash,
+                status_code=record.status_code,
+                content_type=record.content_type,
+                body=record.response_body or b"",
+                expires_at=record.expires_at,
+            )
+        if record is not None:
+            db.delete(record)
+            db.flush()
+        db.add(
+            entities.IdempotencyRecord(
+                key=key,
+                request_hash=request_hash,
+                created_at=now,
+                expires_at=now + timedelta(seconds=settings.idempotency_lock_seconds),
+            )
+        )
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return "pending", None
+    return "claimed", None
+
+
+def _store(key: str, response: StoredResponse, purge: bool) -> None:
+    with SessionLocal() as db:
+        record = db.get(entities.IdempotencyRecord, key)
+        if record is None:
+            return
+        record.status_code = response.status_code
+        record.content_type = response.content_type
+        record.response_body = response.body
+        record.expires_at = response.expires_at
+        if purge:
+            db.execute(
+                delete(entities.IdempotencyRecord).where(entities.IdempotencyRecord.expires_at < datetime.utcnow())
+            )
+        db.commit()
+
+
+def _release(key: str) -> None:
+    with SessionLocal() as db:
+        db.execute(delete(entities.IdempotencyRecord).where(entities.IdempotencyRecord.key == key))
+        db.commit()
+
+
+class IdempotencyMiddleware:
+    """Replays the first response for a repeated ``Idempotency-Key`` on the given POST paths."""
+
+    def __init__(self, app, paths: Iterable[str]):
+        self.app = app
+        self.paths = set(paths)
+        self.cache = LRUCache(settings.idempotency_cache_size)
+        self.inflight: dict[str, asyncio.Event] = {}
+        self.stores = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get("idempotency-key")
+        if not idempotency_key:
+            await self.app(scope, receive, send)
+            return
+
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+        request_hash = hashlib.sha256(body).hexdigest()
+        key = hashlib.sha256(
+            "|".join([headers.get("authorization", ""), scope["path"], idempotency_key]).encode()
+        ).hexdigest()
+
+        try:
+            stored = await self._wait_for_turn(key, request_hash)
+        except asyncio.TimeoutError:
+            response = JSONResponse({"detail": "A request with this Idempotency-Key is still in progress"}, status_code=409)
+            await response(scope, receive, send)
+            return
+        if stored is not None:
+            await self._replay(stored, request_hash, scope, receive, send)
+            return
+
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        status_code = 500
+        content_type = None
+        chunks = []
+
+        async def capture_send(message):
+            nonlocal status_code, content_type
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                content_type = Headers(raw=message.get("headers", [])).get("content-type")
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        finally:
+            try:
+                if status_code < 500:
+                    stored = StoredResponse(
+                        request_hash=request_hash,
+                        status_code=status_code,
+                        content_type=content_type,
+                        body=b"".join(chunks),
+                        expires_at=datetime.utcnow() + timedelta(seconds=settings.idempotency_ttl_seconds),
+                    )
+                    self.stores += 1
+                    await run_in_threadpool(_store, key, stored, self.stores % PURGE_EVERY == 0)
+                    self.cache.put(key, stored)
+                else:
+                    await run_in_threadpool(_release, key)
+            finally:
+                self.inflight.pop(key).set()
+
+    async def _wait_for_turn(self, key: str, request_hash: str) -> Optional[StoredResponse]:
+        """Return the stored response, or ``None`` once this request owns the key."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.idempotency_wait_seconds
+        while True:
+            stored = self.cache.get(key)
+            if stored is not None:
+                return stored
+            event = self.inflight.get(key)
+            if event is not None:
+                await asyncio.wait_for(event.wait(), max(deadline - loop.time(), 0))
+                continue
+            event = self.inflight[key] = asyncio.Event()
+            try:
+                state, stored = await run_in_threadpool(_claim, key, request_hash)
+            except BaseException:
+                # Never leave the key marked in flight, or every retry here would wait and then 409.
+                self.inflight.pop(key).set()
+                raise
+            if state == "claimed":
+                return None
+            self.inflight.pop(key).set()
+            if state == "done":
+                self.cache.put(key, stored)
+                return stored
+            # Another worker holds the key; poll the table until it finishes.
+            if loop.time() >= deadline:
+                raise asyncio.TimeoutError
+            await asyncio.sleep(0.1)
+
+    async def _replay(self, stored: StoredResponse, request_hash: str, scope, receive, send):
+        if stored.request_hash != request_hash:
+            response = JSONResponse({"detail": "Idempotency-Key was reused with a different request body"}, status_code=422)
+            await response(scope, receive, send)
+            return
+        headers = [(b"content-length", str(len(stored.body)).encode()), (b"idempotent-replayed", b"true")]
+        if stored.content_type:
+            headers.append((b"content-type", stored.content_type.encode()))
+        await send({"type": "http.response.start", "status": stored.status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": stored.body})
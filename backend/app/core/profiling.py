@@ -0,0 +1,217 @@
+import contextvars
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from jose import JWTError, jwt
+from sqlalchemy import event, select
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+
+from .config import get_settings
+from ..database import SessionLocal
+from ..models import entities
+
+settings = get_settings()
+
+PROFILE_HEADER = "x-profile"
+MAX_STACK_DEPTH = 64
+
+
+@dataclass
+class RequestContext:
+    route: str
+    profile: Optional["SamplingProfile"] = None
+
+
+current_request: contextvars.ContextVar[Optional[RequestContext]] = contextvars.ContextVar("current_request", default=None)
+slow_queries: deque = deque(maxlen=settings.slow_query_log_size)
+profiles: "OrderedDict[str, dict]" = OrderedDict()
+
+
+@dataclass
+class SamplingProfile:
+    """Periodically samples the stacks of the threads serving one request."""
+
+    route: str
+    interval: float = settings.profile_interval_seconds
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    threads: set = field(default_factory=set)
+    samples: Counter = field(default_factory=Counter)
+
+    def __post_init__(self):
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._run, name=f"profile-{self.id}", daemon=True)
+
+    def add_thread(self, thread_id: int) -> None:
+        self.threads.add(thread_id)
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._sampler.join()
+        self.duration = time.perf_counter() - self.started
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in list(self.threads):
+                frame = frames.get(thread_id)
+                stack = []
+                while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                    frame = frame.f_back
+                if stack:
+                    self.samples[";".join(reversed(stack))] += 1
+
+    def report(self) -> dict:
+        leaves = Counter()
+        for stack, count in self.samples.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return {
+            "id": self.id,
+            "route": self.route,
+            "duration_ms": round(self.duration * 1000, 3),
+            "interval_ms": self.interval * 1000,
+            "samples": sum(self.samples.values()),
+            "top_frames": [{"frame": frame, "samples": count} for frame, count in leaves.most_common(25)],
+            # Collapsed stacks, one "frame;frame;frame count" line each, as consumed by flamegraph tools.
+            "collapsed": "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common()),
+        }
+
+
+def _store_profile(report: dict) -> None:
+    profiles[report["id"]] = report
+    while len(profiles) > settings.profile_store_size:
+        profiles.popitem(last=False)
+
+
+def _is_admin(authorization: str) -> bool:
+    if not authorization.lower().startswith("bearer "):
+        return False
+    try:
+        email = jwt.decode(authorization[7:], settings.secret_key, algorithms=[settings.algorithm]).get("sub")
+    except JWTError:
+        return False
+    with SessionLocal() as db:
+        role = db.execute(
+            select(entities.User.role).where(entities.User.email == email, entities.User.active == True)
+        ).scalar()
+    return role == "System Admin"
+
+
+class ProfilingMiddleware:
+    """Tags each request with its route and profiles it when an admin sends ``X-Profile: 1``."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        context = RequestContext(route=f"{scope['method']} {scope['path']}")
+        token = current_request.set(context)
+        try:
+            headers = Headers(scope=scope)
+            if headers.get(PROFILE_HEADER) == "1" and await run_in_threadpool(_is_admin, headers.get("authorization", "")):
+                await self._profiled(context, scope, receive, send)
+            else:
+                await self.app(scope, receive, send)
+        finally:
+            current_request.reset(token)
+
+    async def _profiled(self, context: RequestContext, scope, receive, send):
+        profile = context.profile = SamplingProfile(route=context.route)
+        profile.add_thread(threading.get_ident())
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", profile.id.encode())]}
+            await send(message)
+
+        profile.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profile.stop()
+            _store_profile(profile.report())
+
+
+def _parameters_shape(parameters) -> object:
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)) and parameters and isinstance(parameters[0], (dict, list, tuple)):
+        return {"rows": len(parameters), "row": _parameters_shape(parameters[0])}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _explain(conn, cursor, statement: str, parameters) -> Optional[str]:
+    postgres = conn.dialect.name == "postgresql"
+    prefix = "EXPLAIN " if postgres else "EXPLAIN QUERY PLAN "
+    try:
+        explain_cursor = cursor.connection.cursor()
+        try:
+            # The EXPLAIN shares the request's transaction; on Postgres a failure there would abort it,
+            # so it runs inside a savepoint that is rolled back on error.
+            if postgres:
+                explain_cursor.execute("SAVEPOINT profiling_explain")
+            try:
+                explain_cursor.execute(prefix + statement, parameters)
+                plan = "\n".join(" ".join(str(value) for value in row) for row in explain_cursor.fetchall())
+            except Exception:
+                if postgres:
+                    explain_cursor.execute("ROLLBACK TO SAVEPOINT profiling_explain")
+                raise
+            if postgres:
+                explain_cursor.execute("RELEASE SAVEPOINT profiling_explain")
+            return plan
+        finally:
+            explain_cursor.close()
+    except Exception as exc:  # the plan is diagnostic only; never fail the request over it
+        return f"EXPLAIN failed: {exc}"
+
+
+def install_query_capture(engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+        request = current_request.get()
+        if request is not None and request.profile is not None:
+            request.profile.add_thread(threading.get_ident())
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context):
+        if context.connection is not None and context.connection.info.get("query_start"):
+            context.connection.info["query_start"].pop()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+        if duration_ms < settings.slow_query_threshold_ms:
+            return
+        request = current_request.get()
+        plan = None
+        if duration_ms >= settings.explain_threshold_ms and not executemany:
+            plan = _explain(conn, cursor, statement, parameters)
+        slow_queries.append(
+            {
+                "timestamp": datetime.utcnow(),
+                "route": request.route if request else None,
+                "duration_ms": round(duration_ms, 3),
+                "statement": statement,
+                "parameters": _parameters_shape(parameters),
+                "plan": plan,
+            }
+        )
@@ -0,0 +1,168 @@
+import math
+import threading
+import time
+from typing import Dict, Optional, Protocol, Tuple
+
+from jose import JWTError, jwt
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+
+from .config import get_settings
+
+settings = get_settings()
+
+EXEMPT_PATHS = {"/health"}
+ANONYMOUS_PATHS = {"/api/auth/token"}
+SWEEP_INTERVAL_SECONDS = 60.0
+
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+def parse_budget(budget: str) -> Tuple[float, float]:
+    """Turn ``"<requests>/<seconds>"`` into a bucket ``(capacity, refill per second)``."""
+    requests, seconds = budget.split("/")
+    return float(requests), float(requests) / float(seconds)
+
+
+class BucketBackend(Protocol):
+    async def take(self, key: str, capacity: float, rate: float) -> float:
+        """Consume one token and return 0, or the seconds until a token is available."""
+
+
+class InMemoryBucketBackend:
+    def __init__(self):
+        # key -> (tokens, updated, time at which the bucket is full again)
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + SWEEP_INTERVAL_SECONDS
+
+    async def take(self, key: str, capacity: float, rate: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+            tokens, updated, _ = self._buckets.get(key, (capacity, now, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            wait = 0.0 if tokens >= 1 else (1 - tokens) / rate
+            if not wait:
+                tokens -= 1
+            self._buckets[key] = (tokens, now, now + (capacity - tokens) / rate)
+            return wait
+
+    def _sweep(self, now: float) -> None:
+        # A bucket that has refilled is indistinguishable from a missing one, like the EXPIRE in the Redis script.
+        for key in [key for key, (_, _, full_at) in self._buckets.items() if full_at <= now]:
+            del self._buckets[key]
+        self._next_sweep = now + SWEEP_INTERVAL_SECONDS
+
+
+class RedisBucketBackend:
+    def __init__(self, url: str):
+        from redis import asyncio as redis
+
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def take(self, key: str, capacity: float, rate: float) -> float:
+        wait = await self._script(keys=[f"ratelimit:{key}"], args=[capacity, rate, time.time()])
+        return float(wait)
+
+
+def get_bucket_backend() -> BucketBackend:
+    if settings.rate_limit_backend_url:
+        return RedisBucketBackend(settings.rate_limit_backend_url)
+    return InMemoryBucketBackend()
+
+
+def client_ip(scope, headers: Headers) -> str:
+    if settings.trust_forwarded_for and "x-forwarded-for" in headers:
+        return headers["x-forwarded-for"].split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _too_many(status_code: int, detail: str, retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        {"detail": detail},
+        status_code=status_code,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+class RateLimitMiddleware:
+    """Token-bucket limits per authenticated user (or client IP) and route."""
+
+    def __init__(self, app, backend: Optional[BucketBackend] = None):
+        self.app = app
+        self.backend = backend or get_bucket_backend()
+        self.default_budget = parse_budget(settings.rate_limit_default)
+        self.route_budgets = {route: parse_budget(budget) for route, budget in settings.rate_limits.items()}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        route = f"{scope['method']} {scope['path']}"
+        identity = self._identity(scope, headers)
+        if route in self.route_budgets:
+            capacity, rate = self.route_budgets[route]
+            bucket = f"{identity}|{route}"
+        else:
+            capacity, rate = self.default_budget
+            bucket = f"{identity}|*"
+        wait = await self.backend.take(bucket, capacity, rate)
+        if wait > 0:
+            await _too_many(429, "Rate limit exceeded", wait)(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+    def _identity(self, scope, headers: Headers) -> str:
+        authorization = headers.get("authorization", "")
+        if scope["path"] not in ANONYMOUS_PATHS and authorization.lower().startswith("bearer "):
+            try:
+                payload = jwt.decode(authorization[7:], settings.secret_key, algorithms=[settings.algorithm])
+                if payload.get("sub"):
+                    return f"user:{payload['sub']}"
+            except JWTError:
+                pass
+        return f"ip:{client_ip(scope, headers)}"
+
+
+class ConcurrencyLimitMiddleware:
+    """Sheds requests with 503 once more are in flight than the database pool can serve."""
+
+    def __init__(self, app, max_concurrent: Optional[int] = None):
+        self.app = app
+        self.max_concurrent = max_concurrent or settings.max_concurrent_requests
+        self.in_flight = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        if self.in_flight >= self.max_concurrent:
+            await _too_many(503, "Server busy, retry shortly", 1)(scope, receive, send)
+            return
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
@@ -4,9 +4,24 @@ from .core.config import get_settings
 
 settings = get_settings()
 
-engine = create_engine(settings.database_url, future=True)
+engine = create_engine(
+    settings.database_url,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    future=True,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
 
+# Background jobs get their own small pool (optionally on a replica) so they never starve request handlers.
+# Each job holds a session plus one for progress updates, and the dispatcher needs one more.
+job_engine = create_engine(
+    settings.job_database_url or settings.database_url,
+    pool_size=settings.job_workers * 2 + 1,
+    max_overflow=0,
+    future=True,
+)
+JobSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=job_engine, future=True)
+
 Base = declarative_base()
 
 
@@ -1,13 +1,19 @@
-from typing import List
-from fastapi import Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import Depends, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
+from pydantic import BaseModel
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from .core.cache import cache
 from .core.config import get_settings
 from .core.security import verify_password
 from .database import get_db
 from .models import entities
+from .queries import user_by_email
 
 settings = get_settings()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
@@ -26,10 +32,17 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = db.query(entities.User).filter(entities.User.email == email, entities.User.active == True).first()
-    if user is None:
+    snapshot = cache.get_or_load(f"user:{email}", lambda: _user_snapshot(db, email), settings.user_cache_ttl_seconds)
+    if snapshot is None:
         raise credentials_exception
-    return user
+    return entities.User(**snapshot)
+
+
+def _user_snapshot(db: Session, email: str) -> dict | None:
+    user = user_by_email(db, email, active_only=True)
+    if user is None:
+        return None
+    return {"id": user.id, "name": user.name, "email": user.email, "role": user.role, "active": user.active}
 
 
 def require_roles(allowed_roles: List[str]):
@@ -42,9 +55,35 @@ def require_roles(allowed_roles: List[str]):
 
 
 def authenticate_user(db: Session, email: str, password: str) -> entities.User | None:
-    user = db.query(entities.User).filter(entities.User.email == email).first()
+    user = user_by_email(db, email)
     if not user:
         return None
     if not verify_password(password, user.password_hash):
         return None
     return user
+
+
+def sparse_fields(schema: type[BaseModel]):
+    allowed = list(schema.__fields__)
+
+    def field_parser(
+        fields: Optional[str] = Query(None, description=f"Comma-separated subset of: {', '.join(allowed)}")
+    ) -> Optional[List[str]]:
+        if fields is None:
+            return None
+        requested = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+        unknown = [name for name in requested if name not in allowed]
+        if not requested or unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(unknown) or '(none requested)'}",
+            )
+        return requested
+
+    return field_parser
+
+
+def fields_response(db: Session, model, fields: List[str], *criteria) -> JSONResponse:
+    columns = [getattr(model, name) for name in fields]
+    rows = db.execute(select(*columns).where(*criteria)).mappings().all()
+    return JSONResponse(jsonable_encoder([dict(row) for row in rows]))
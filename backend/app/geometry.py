@@ -0,0 +1,64 @@
+import math
+from typing import List, Sequence, Tuple
+
+Point = Sequence[float]
+
+
+def ring_bounds(ring: Sequence[Point]) -> Tuple[float, float, float, float]:
+    xs = [point[0] for point in ring]
+    ys = [point[1] for point in ring]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def ring_centroid(ring: Sequence[Point]) -> Tuple[float, float]:
+    area = cx = cy = 0.0
+    for (x0, y0), (x1, y1) in zip(ring, ring[1:]):
+        cross = x0 * y1 - x1 * y0
+        area += cross
+        cx += (x0 + x1) * cross
+        cy += (y0 + y1) * cross
+    if area == 0:
+        return sum(p[0] for p in ring) / len(ring), sum(p[1] for p in ring) / len(ring)
+    return cx / (3 * area), cy / (3 * area)
+
+
+def tile_tolerance(zoom: int) -> float:
+    """Width of one 256px web-map tile pixel at ``zoom``, in degrees."""
+    return 360 / (256 * 2**zoom)
+
+
+def _segment_distance(point: Point, start: Point, end: Point) -> float:
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    if dx == 0 and dy == 0:
+        return math.hypot(point[0] - start[0], point[1] - start[1])
+    t = max(0.0, min(1.0, ((point[0] - start[0]) * dx + (point[1] - start[1]) * dy) / (dx * dx + dy * dy)))
+    return math.hypot(point[0] - (start[0] + t * dx), point[1] - (start[1] + t * dy))
+
+
+def _douglas_peucker(points: Sequence[Point], tolerance: float) -> List[Point]:
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        index, distance = first, 0.0
+        for i in range(first + 1, last):
+            d = _segment_distance(points[i], points[first], points[last])
+            if d > distance:
+                index, distance = i, d
+        if distance > tolerance:
+            keep[index] = True
+            stack.extend([(first, index), (index, last)])
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def simplify_ring(ring: Sequence[Point], tolerance: float) -> List[Point]:
+    """Douglas-Peucker simplify a closed ring, never collapsing it below a triangle."""
+    if len(ring) <= 4:
+        return list(ring)
+    # Split at the vertex farthest from the start so the closing point is not an anchor of every segment.
+    far = max(range(len(ring)), key=lambda i: math.hypot(ring[i][0] - ring[0][0], ring[i][1] - ring[0][1]))
+    simplified = _douglas_peucker(ring[: far + 1], tolerance)[:-1] + _douglas_peucker(ring[far:], tolerance)
+    if len(simplified) < 4:
+        return list(ring)
+    return simplified
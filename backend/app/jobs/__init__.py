@@ -0,0 +1,12 @@
+from . import reports, statements
+from .runner import JobCancelled, JobContext, job_types, register_job, runner
+
+__all__ = [
+    "reports",
+    "statements",
+    "JobCancelled",
+    "JobContext",
+    "job_types",
+    "register_job",
+    "runner",
+]
@@ -0,0 +1,95 @@
+import csv
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..models import entities
+from .runner import JobContext, register_job
+
+STREAM_CHUNK = 2000
+
+
+def periods_elapsed(frequency: str, start: date, end: date) -> int:
+    if end < start:
+        return 0
+    frequency = frequency.strip().lower()
+    if frequency == "weekly":
+        return (end - start).days // 7
+    months = (end.year - start.year) * 12 + end.month - start.month - (end.day < start.day)
+    if frequency == "quarterly":
+        return months // 3
+    if frequency in ("annually", "yearly"):
+        return months // 12
+    return months
+
+
+@register_job("ledger_export")
+def ledger_export(context: JobContext, db: Session, params: dict) -> str:
+    total = db.execute(select(func.count()).select_from(entities.Payment)).scalar() or 0
+    rows = db.execute(
+        select(
+            entities.Payment.id,
+            entities.Payment.date,
+            entities.Payment.amount,
+            entities.Payment.method,
+            entities.Payment.reference,
+            entities.Sale.id,
+            entities.Stand.project_id,
+            entities.Stand.stand_number,
+            entities.Client.full_name,
+        )
+        .join(entities.Sale, entities.Sale.id == entities.Payment.sale_id)
+        .join(entities.Stand, entities.Stand.id == entities.Sale.stand_id)
+        .join(entities.Client, entities.Client.id == entities.Sale.client_id)
+        .order_by(entities.Payment.date, entities.Payment.id)
+        .execution_options(yield_per=STREAM_CHUNK)
+    )
+    path = context.output_path("ledger.csv")
+    with open(path, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(
+            ["payment_id", "date", "amount", "method", "reference", "sale_id", "project_id", "stand_number", "client"]
+        )
+        for written, partition in enumerate(rows.partitions(), start=1):
+            writer.writerows(partition)
+            context.progress(min(written * STREAM_CHUNK, total) / total if total else 1.0, "Writing ledger")
+    return path
+
+
+@register_job("arrears_report")
+def arrears_report(context: JobContext, db: Session, params: dict) -> str:
+    as_of = date.fromisoformat(params["as_of"]) if params.get("as_of") else date.today()
+    paid = (
+        select(entities.Payment.sale_id, func.sum(entities.Payment.amount).label("paid"))
+        .where(entities.Payment.date <= as_of)
+        .group_by(entities.Payment.sale_id)
+        .subquery()
+    )
+    plans = db.execute(
+        select(
+            entities.PaymentPlan,
+            entities.Client.full_name,
+            entities.Stand.stand_number,
+            func.coalesce(paid.c.paid, 0),
+        )
+        .join(entities.Sale, entities.Sale.id == entities.PaymentPlan.sale_id)
+        .join(entities.Client, entities.Client.id == entities.Sale.client_id)
+        .join(entities.Stand, entities.Stand.id == entities.Sale.stand_id)
+        .outerjoin(paid, paid.c.sale_id == entities.PaymentPlan.sale_id)
+        .where(entities.Sale.status == entities.SaleStatus.ACTIVE)
+        .order_by(entities.PaymentPlan.sale_id)
+    ).all()
+    path = context.output_path(f"arrears-{as_of.isoformat()}.csv")
+    with open(path, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["sale_id", "client", "stand_number", "expected", "paid", "arrears"])
+        for index, (plan, client_name, stand_number, paid_amount) in enumerate(plans, start=1):
+            installments = periods_elapsed(plan.frequency, plan.start_date, min(as_of, plan.end_date))
+            expected = min(Decimal(plan.total_due), Decimal(plan.deposit_due) + installments * Decimal(plan.installment_amount))
+            arrears = max(Decimal(0), expected - Decimal(paid_amount))
+            if arrears > 0:
+                writer.writerow([plan.sale_id, client_name, stand_number, expected, paid_amount, arrears])
+            context.progress(index / len(plans), "Checking payment plans")
+    return path
@@ -0,0 +1,217 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from ..core.config import get_settings
+from ..database import JobSessionLocal
+from ..models import entities
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+PROGRESS_INTERVAL_SECONDS = 0.5
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobContext:
+    """Handed to a running job to report progress, honour cancellation and place its output."""
+
+    def __init__(self, job_id: int):
+        self.job_id = job_id
+        self.summary: str | None = None
+        self._last_report = 0.0
+
+    def progress(self, fraction: float, message: str | None = None, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_report < PROGRESS_INTERVAL_SECONDS:
+            return
+        self._last_report = now
+        with JobSessionLocal() as db:
+            cancel_requested = db.execute(
+                update(entities.Job)
+                .where(entities.Job.id == self.job_id)
+                .values(progress=min(max(fraction, 0.0), 1.0), message=message, heartbeat_at=datetime.utcnow())
+                .returning(entities.Job.cancel_requested)
+            ).scalar()
+            db.commit()
+        if cancel_requested:
+            raise JobCancelled()
+
+    def output_path(self, filename: str) -> str:
+        directory = os.path.join(settings.job_results_dir, str(self.job_id))
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, filename)
+
+
+JobHandler = Callable[[JobContext, Session, dict], str]
+
+
+@dataclass
+class JobType:
+    handler: JobHandler
+    max_concurrency: int
+
+
+job_types: Dict[str, JobType] = {}
+
+
+def register_job(name: str, default_concurrency: int = 1):
+    def decorator(handler: JobHandler) -> JobHandler:
+        job_types[name] = JobType(handler, settings.job_type_limits.get(name, default_concurrency))
+        return handler
+
+    return decorator
+
+
+class JobRunner:
+    """Claims pending jobs from the jobs table and runs them on a dedicated thread pool."""
+
+    def __init__(self, workers: int):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self.workers = workers
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.running: Dict[int, str] = {}
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._dispatcher: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._dispatcher is None:
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, name="job-dispatcher", daemon=True)
+            self._dispatcher.start()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            try:
+                self._dispatch()
+            except Exception:
+                logger.exception("Job dispatch failed")
+            self._wake.wait(settings.job_poll_seconds)
+            self._wake.clear()
+
+    def _dispatch(self) -> None:
+        with JobSessionLocal() as db:
+            self._heartbeat(db)
+            self._recover_stale(db)
+            pending = db.execute(
+                select(entities.Job.id, entities.Job.job_type)
+                .where(entities.Job.status == entities.JobStatus.PENDING)
+                .order_by(entities.Job.id)
+            ).all()
+            for job_id, job_type in pending:
+                with self._lock:
+                    if len(self.running) >= self.workers:
+                        return
+                if job_type not in job_types:
+                    continue
+                if self._claim(db, job_id, job_type):
+                    with self._lock:
+                        self.running[job_id] = job_type
+                    self.executor.submit(self._run, job_id, job_type)
+
+    def _heartbeat(self, db: Session) -> None:
+        # Covers jobs that go a long time between progress reports.
+        with self._lock:
+            running = list(self.running)
+        if running:
+            db.execute(
+                update(entities.Job)
+                .where(entities.Job.id.in_(running), entities.Job.worker_id == self.worker_id)
+                .values(heartbeat_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+
+    def _recover_stale(self, db: Session) -> None:
+        """Finish RUNNING jobs whose worker stopped heartbeating, so they no longer hold their type's slot."""
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.job_stale_seconds)
+        stale = (
+            entities.Job.status == entities.JobStatus.RUNNING,
+            func.coalesce(entities.Job.heartbeat_at, entities.Job.started_at) < cutoff,
+        )
+        recovered = 0
+        for cancel_requested, values in (
+            (True, {"status": entities.JobStatus.CANCELLED, "message": "Cancelled"}),
+            (False, {"status": entities.JobStatus.FAILED, "error": "Worker stopped responding"}),
+        ):
+            recovered += db.execute(
+                update(entities.Job)
+                .where(*stale, entities.Job.cancel_requested == cancel_requested)
+                .values(finished_at=datetime.utcnow(), **values)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+        db.commit()
+        if recovered:
+            logger.warning("Recovered %s stale running job(s)", recovered)
+
+    def _claim(self, db: Session, job_id: int, job_type: str) -> bool:
+        if db.get_bind().dialect.name == "postgresql":
+            # Serialize claims per type: under READ COMMITTED two dispatchers would not see each other's
+            # uncommitted claim in the count below. SQLite already serializes writers.
+            db.execute(select(func.pg_advisory_xact_lock(func.hashtext(job_type))))
+        # The per-type limit counts RUNNING rows across every worker process sharing the database.
+        running_of_type = (
+            select(func.count())
+            .select_from(entities.Job)
+            .where(entities.Job.job_type == job_type, entities.Job.status == entities.JobStatus.RUNNING)
+            .scalar_subquery()
+        )
+        claimed = db.execute(
+            update(entities.Job)
+            .where(
+                entities.Job.id == job_id,
+                entities.Job.status == entities.JobStatus.PENDING,
+                running_of_type < job_types[job_type].max_concurrency,
+            )
+            .values(
+                status=entities.JobStatus.RUNNING,
+                started_at=datetime.utcnow(),
+                heartbeat_at=datetime.utcnow(),
+                worker_id=self.worker_id,
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        return claimed == 1
+
+    def _run(self, job_id: int, job_type: str) -> None:
+        context = JobContext(job_id)
+        values = {}
+        try:
+            with JobSessionLocal() as db:
+                params = db.get(entities.Job, job_id).params or {}
+                result_path = job_types[job_type].handler(context, db, params)
+            values.update(
+                status=entities.JobStatus.SUCCEEDED, progress=1.0, result_path=result_path, message=context.summary or "Done"
+            )
+        except JobCancelled:
+            values.update(status=entities.JobStatus.CANCELLED, message="Cancelled")
+        except Exception as exc:
+            logger.exception("Job %s failed", job_id)
+            values.update(status=entities.JobStatus.FAILED, error=repr(exc))
+        finally:
+            values["finished_at"] = datetime.utcnow()
+            with JobSessionLocal() as db:
+                db.execute(update(entities.Job).where(entities.Job.id == job_id).values(**values))
+                db.commit()
+            with self._lock:
+                self.running.pop(job_id, None)
+            self.wake()
+
+
+runner = JobRunner(settings.job_workers)
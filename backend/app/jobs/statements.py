@@ -0,0 +1,214 @@
+import gzip
+import io
+import multiprocessing
+import os
+import tarfile
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date
+from decimal import Decimal
+from typing import Callable, Optional
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from ..core.config import get_settings
+from ..database import job_engine
+from ..models import entities
+from .runner import JobContext, register_job
+
+settings = get_settings()
+
+_worker_engine = None
+
+
+def _money(value) -> str:
+    return f"{Decimal(value):,.2f}"
+
+
+def render_statement(client: dict, period_end: str) -> str:
+    lines = [
+        "STATEMENT OF ACCOUNT",
+        f"Client: {client['full_name']} ({client['national_id']})",
+        f"Contact: {client['email'] or '-'} / {client['phone'] or '-'}",
+        f"Period ending: {period_end}",
+        "",
+    ]
+    total_balance = Decimal(0)
+    for sale in client["sales"]:
+        lines.append(
+            f"Sale #{sale['id']} - Stand {sale['stand_number']} ({sale['project']}) "
+            f"sold {sale['sale_date']} for {_money(sale['sale_price'])} [{sale['status']}]"
+        )
+        plan = sale["plan"]
+        if plan:
+            lines.append(
+                f"  Plan: deposit {_money(plan['deposit_due'])}, {_money(plan['installment_amount'])} {plan['frequency']} "
+                f"from {plan['start_date']} to {plan['end_date']} (total due {_money(plan['total_due'])})"
+            )
+        lines.append(f"  {'Date':<12}{'Method':<12}{'Reference':<20}{'Amount':>14}")
+        paid = Decimal(0)
+        for payment in sale["payments"]:
+            paid += payment["amount"]
+            lines.append(
+                f"  {payment['date']!s:<12}{payment['method']:<12}{payment['reference'] or '':<20}{_money(payment['amount']):>14}"
+            )
+        # A cancelled sale stays on the statement for its payment history but no longer owes anything.
+        if sale["status"] == entities.SaleStatus.CANCELLED.value:
+            balance = Decimal(0)
+        else:
+            balance = Decimal(plan["total_due"] if plan else sale["sale_price"]) - paid
+        total_balance += balance
+        lines.extend([f"  Paid: {_money(paid)}   Balance: {_money(balance)}", ""])
+    lines.append(f"Total balance: {_money(total_balance)}")
+    return "\n".join(lines) + "\n"
+
+
+def load_chunk(db: Session, first_id: int, last_id: int, period_end: date) -> list[dict]:
+    clients = [
+        dict(row, sales=[])
+        for row in db.execute(
+            select(
+                entities.Client.id,
+                entities.Client.full_name,
+                entities.Client.national_id,
+                entities.Client.email,
+                entities.Client.phone,
+            )
+            .where(entities.Client.id.between(first_id, last_id))
+            .order_by(entities.Client.id)
+        ).mappings()
+    ]
+    if not clients:
+        return clients
+    by_client = {client["id"]: client for client in clients}
+    sales = {}
+    for row in db.execute(
+        select(
+            entities.Sale.id,
+            entities.Sale.client_id,
+            entities.Sale.sale_date,
+            entities.Sale.sale_price,
+            entities.Sale.status,
+            entities.Stand.stand_number,
+            entities.Project.name.label("project"),
+        )
+        .join(entities.Stand, entities.Stand.id == entities.Sale.stand_id)
+        .join(entities.Project, entities.Project.id == entities.Stand.project_id)
+        .where(entities.Sale.client_id.in_(by_client), entities.Sale.sale_date <= period_end)
+        .order_by(entities.Sale.sale_date, entities.Sale.id)
+    ).mappings():
+        sale = dict(row, status=row["status"].value, plan=None, payments=[])
+        sales[sale["id"]] = sale
+        by_client[sale["client_id"]]["sales"].append(sale)
+    if not sales:
+        return clients
+    for row in db.execute(
+        select(
+            entities.PaymentPlan.sale_id,
+            entities.PaymentPlan.total_due,
+            entities.PaymentPlan.deposit_due,
+            entities.PaymentPlan.installment_amount,
+            entities.PaymentPlan.frequency,
+            entities.PaymentPlan.start_date,
+            entities.PaymentPlan.end_date,
+        ).where(entities.PaymentPlan.sale_id.in_(sales))
+    ).mappings():
+        sales[row["sale_id"]]["plan"] = dict(row)
+    payments = defaultdict(list)
+    for row in db.execute(
+        select(
+            entities.Payment.sale_id,
+            entities.Payment.date,
+            entities.Payment.amount,
+            entities.Payment.method,
+            entities.Payment.reference,
+        )
+        .where(entities.Payment.sale_id.in_(sales), entities.Payment.date <= period_end)
+        .order_by(entities.Payment.date, entities.Payment.id)
+    ).mappings():
+        payments[row["sale_id"]].append(dict(row))
+    for sale_id, sale_payments in payments.items():
+        sales[sale_id]["payments"] = sale_payments
+    return clients
+
+
+def _init_worker(database_url: str) -> None:
+    global _worker_engine
+    _worker_engine = create_engine(database_url, pool_size=1, max_overflow=0, future=True)
+
+
+def build_chunk(first_id: int, last_id: int, period_end: str) -> list[tuple[str, bytes]]:
+    """Runs in a worker process: load, render and compress the statements for one client id range."""
+    with Session(_worker_engine) as db:
+        clients = load_chunk(db, first_id, last_id, date.fromisoformat(period_end))
+    return [
+        (f"{client['id']:08d}.txt.gz", gzip.compress(render_statement(client, period_end).encode(), compresslevel=6))
+        for client in clients
+    ]
+
+
+def client_id_ranges(ids: list[int], size: int) -> list[tuple[int, int]]:
+    return [(ids[offset], ids[min(offset + size, len(ids)) - 1]) for offset in range(0, len(ids), size)]
+
+
+def generate_statements(
+    db: Session,
+    path: str,
+    period_end: date,
+    processes: int,
+    chunk_size: int,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+    database_url: Optional[str] = None,
+) -> int:
+    """Write one gzipped statement per client into the tar at ``path`` and return how many were written."""
+    ids = db.execute(select(entities.Client.id).order_by(entities.Client.id)).scalars().all()
+    db.rollback()
+    database_url = database_url or job_engine.url.render_as_string(hide_password=False)
+    done = 0
+    # Spawned workers avoid forking a process that holds live threads and database connections; each
+    # opens its own connection so loading scales with the pool instead of running on the job thread.
+    with ProcessPoolExecutor(
+        max_workers=processes, mp_context=multiprocessing.get_context("spawn"), initializer=_init_worker, initargs=(database_url,)
+    ) as pool, tarfile.open(path, "w") as archive:
+        in_flight = set()
+
+        def write(rendered: list[tuple[str, bytes]]) -> None:
+            nonlocal done
+            for name, payload in rendered:
+                info = tarfile.TarInfo(name)
+                info.size = len(payload)
+                info.mtime = int(time.time())
+                archive.addfile(info, io.BytesIO(payload))
+            done += len(rendered)
+            if on_progress is not None:
+                on_progress(done, len(ids))
+
+        for first_id, last_id in client_id_ranges(ids, chunk_size):
+            in_flight.add(pool.submit(build_chunk, first_id, last_id, period_end.isoformat()))
+            # Keep every process busy while bounding how many finished chunks wait in memory.
+            if len(in_flight) >= processes * 2:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    write(future.result())
+        for future in in_flight:
+            write(future.result())
+    return done
+
+
+@register_job("client_statements")
+def client_statements(context: JobContext, db: Session, params: dict) -> str:
+    period_end = date.fromisoformat(params["period_end"]) if params.get("period_end") else date.today()
+    processes = settings.statement_processes or os.cpu_count() or 1
+    path = context.output_path(f"statements-{period_end.isoformat()}.tar")
+    started = time.perf_counter()
+
+    def on_progress(done: int, total: int) -> None:
+        rate = done / (time.perf_counter() - started)
+        context.progress(done / total, f"{done}/{total} statements, {rate:.0f}/s")
+
+    done = generate_statements(db, path, period_end, processes, settings.statement_chunk_size, on_progress)
+    elapsed = time.perf_counter() - started
+    context.summary = f"{done} statements in {elapsed:.1f}s ({done / elapsed if elapsed else 0:.0f}/s) on {processes} processes"
+    return path
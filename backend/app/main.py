@@ -1,10 +1,24 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .routers import auth, admin, projects, stands, reservations, sales, payments
+from .core.cache import cache
+from .core.compression import CompressionMiddleware
+from .core.idempotency import IdempotencyMiddleware
+from .core.profiling import ProfilingMiddleware, install_query_capture
+from .core.rate_limit import ConcurrencyLimitMiddleware, RateLimitMiddleware
+from .database import engine, job_engine
+from .jobs import runner
+from .routers import auth, admin, projects, stands, reservations, sales, payments, reports, jobs
 
 app = FastAPI(title="Stands Portfolio Administration API")
 
+app.add_middleware(IdempotencyMiddleware, paths=["/api/reservations", "/api/sales", "/api/payments"])
+app.add_middleware(ConcurrencyLimitMiddleware)
+app.add_middleware(RateLimitMiddleware)
+app.add_middleware(ProfilingMiddleware)
+install_query_capture(engine)
+install_query_capture(job_engine)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -12,6 +26,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware)
 
 app.include_router(auth.router, prefix="/api")
 app.include_router(admin.router, prefix="/api")
@@ -20,6 +35,14 @@ app.include_router(stands.router, prefix="/api")
 app.include_router(reservations.router, prefix="/api")
 app.include_router(sales.router, prefix="/api")
 app.include_router(payments.router, prefix="/api")
+app.include_router(reports.router, prefix="/api")
+app.include_router(jobs.router, prefix="/api")
+
+
+@app.on_event("startup")
+def start_background_workers():
+    cache.start_listener()
+    runner.start()
 
 
 @app.get("/health")
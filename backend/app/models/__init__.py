@@ -8,9 +8,14 @@ from .entities import (
     PaymentPlan,
     Payment,
     AuditLog,
+    IdempotencyRecord,
+    ReservationDailyRollup,
+    SalesDailyRollup,
+    Job,
     StandStatus,
     ReservationStatus,
     SaleStatus,
+    JobStatus,
 )
 
 __all__ = [
@@ -23,7 +28,12 @@ __all__ = [
     "PaymentPlan",
     "Payment",
     "AuditLog",
+    "IdempotencyRecord",
+    "ReservationDailyRollup",
+    "SalesDailyRollup",
+    "Job",
     "StandStatus",
     "ReservationStatus",
     "SaleStatus",
+    "JobStatus",
 ]
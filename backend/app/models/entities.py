@@ -1,6 +1,6 @@
 import enum
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Date, DateTime, Enum, Numeric, Text, JSON
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Date, DateTime, Enum, Float, Index, Numeric, Text, JSON, LargeBinary, func
 from sqlalchemy.orm import relationship
 from ..database import Base
 
@@ -26,6 +26,14 @@ class SaleStatus(str, enum.Enum):
     CANCELLED = "CANCELLED"
 
 
+class JobStatus(str, enum.Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -52,6 +60,11 @@ class Project(Base):
 
 class Stand(Base):
     __tablename__ = "stands"
+    __table_args__ = (
+        Index("ix_stands_project_status_price", "project_id", "status", "price"),
+        Index("ix_stands_status_price", "status", "price"),
+        Index("ix_stands_size_m2", "size_m2"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
@@ -60,12 +73,26 @@ class Stand(Base):
     price = Column(Numeric, nullable=False)
     status = Column(Enum(StandStatus), default=StandStatus.AVAILABLE, nullable=False)
     notes = Column(Text)
+    geometry = Column(JSON)
+    centroid_x = Column(Float)
+    centroid_y = Column(Float)
+    min_x = Column(Float)
+    min_y = Column(Float)
+    max_x = Column(Float)
+    max_y = Column(Float)
 
     project = relationship("Project", back_populates="stands")
     reservations = relationship("Reservation", back_populates="stand")
     sale = relationship("Sale", back_populates="stand", uselist=False)
 
 
+Index(
+    "ix_stands_bbox",
+    func.box(func.point(Stand.min_x, Stand.min_y), func.point(Stand.max_x, Stand.max_y)),
+    postgresql_using="gist",
+).ddl_if(dialect="postgresql")
+
+
 class Client(Base):
     __tablename__ = "clients"
 
@@ -82,6 +109,10 @@ class Client(Base):
 
 class Reservation(Base):
     __tablename__ = "reservations"
+    __table_args__ = (
+        Index("ix_reservations_stand_id", "stand_id"),
+        Index("ix_reservations_date_realtor", "reservation_date", "realtor_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     stand_id = Column(Integer, ForeignKey("stands.id"), nullable=False)
@@ -98,6 +129,10 @@ class Reservation(Base):
 
 class Sale(Base):
     __tablename__ = "sales"
+    __table_args__ = (
+        Index("ix_sales_stand_id", "stand_id"),
+        Index("ix_sales_sale_date", "sale_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     stand_id = Column(Integer, ForeignKey("stands.id"), nullable=False)
@@ -152,3 +187,59 @@ class AuditLog(Base):
     entity_id = Column(Integer, nullable=False)
     timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
     meta_json = Column(JSON)
+
+
+class IdempotencyRecord(Base):
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String, primary_key=True)
+    request_hash = Column(String, nullable=False)
+    status_code = Column(Integer)
+    content_type = Column(String)
+    response_body = Column(LargeBinary)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+class ReservationDailyRollup(Base):
+    __tablename__ = "reservation_daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    project_id = Column(Integer, primary_key=True)
+    realtor_id = Column(Integer, primary_key=True)
+    created = Column(Integer, nullable=False, default=0)
+    approved = Column(Integer, nullable=False, default=0)
+    rejected = Column(Integer, nullable=False, default=0)
+    expired = Column(Integer, nullable=False, default=0)
+    converted = Column(Integer, nullable=False, default=0)
+    converted_value = Column(Numeric, nullable=False, default=0)
+
+
+class SalesDailyRollup(Base):
+    __tablename__ = "sales_daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    project_id = Column(Integer, primary_key=True)
+    sales_count = Column(Integer, nullable=False, default=0)
+    sales_value = Column(Numeric, nullable=False, default=0)
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (Index("ix_jobs_status_type", "status", "job_type"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String, nullable=False)
+    params = Column(JSON)
+    status = Column(Enum(JobStatus), default=JobStatus.PENDING, nullable=False)
+    progress = Column(Float, default=0, nullable=False)
+    message = Column(String)
+    cancel_requested = Column(Boolean, default=False, nullable=False)
+    result_path = Column(String)
+    error = Column(Text)
+    created_by = Column(Integer, ForeignKey("users.id"))
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    worker_id = Column(String)
+    heartbeat_at = Column(DateTime)
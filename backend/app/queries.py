@@ -0,0 +1,62 @@
+"""Shared statements for hot-path lookups.
+
+Statements are built once at import with bound parameters, so a request only binds values and
+SQLAlchemy reuses the compiled SQL from its statement cache. Primary-key lookups go through
+``Session.get``, which answers from the identity map when the row is already loaded.
+"""
+from typing import Type, TypeVar
+
+from fastapi import HTTPException
+from sqlalchemy import bindparam, exists, select
+from sqlalchemy.orm import Session
+
+from .models import entities
+
+T = TypeVar("T")
+
+USER_BY_EMAIL = select(entities.User).where(entities.User.email == bindparam("email"))
+ACTIVE_USER_BY_EMAIL = USER_BY_EMAIL.where(entities.User.active == True)
+RESERVATIONS_BY_REALTOR = select(entities.Reservation).where(entities.Reservation.realtor_id == bindparam("realtor_id"))
+ACTIVE_RESERVATION_STATUSES = (entities.ReservationStatus.PENDING, entities.ReservationStatus.APPROVED)
+# Correlated against ``entities.Stand`` in the enclosing statement.
+STAND_HELD = exists().where(
+    entities.Reservation.stand_id == entities.Stand.id,
+    entities.Reservation.status.in_(ACTIVE_RESERVATION_STATUSES),
+)
+RECENT_JOBS = select(entities.Job).order_by(entities.Job.id.desc()).limit(100)
+ALL_ROWS = {
+    model: select(model)
+    for model in (
+        entities.User,
+        entities.Project,
+        entities.Stand,
+        entities.Reservation,
+        entities.Sale,
+        entities.PaymentPlan,
+        entities.Payment,
+    )
+}
+
+
+def get_or_404(db: Session, model: Type[T], ident, detail: str) -> T:
+    instance = db.get(model, ident)
+    if instance is None:
+        raise HTTPException(status_code=404, detail=detail)
+    return instance
+
+
+def all_rows(db: Session, model: Type[T]) -> list[T]:
+    return db.scalars(ALL_ROWS[model]).all()
+
+
+def user_by_email(db: Session, email: str, active_only: bool = False) -> entities.User | None:
+    statement = ACTIVE_USER_BY_EMAIL if active_only else USER_BY_EMAIL
+    return db.scalars(statement, {"email": email}).first()
+
+
+def reservations_for_realtor(db: Session, realtor_id: int) -> list[entities.Reservation]:
+    return db.scalars(RESERVATIONS_BY_REALTOR, {"realtor_id": realtor_id}).all()
+
+
+def recent_jobs(db: Session) -> list[entities.Job]:
+    return db.scalars(RECENT_JOBS).all()
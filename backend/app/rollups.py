@@ -0,0 +1,161 @@
+import argparse
+from datetime import date, timedelta
+from typing import Iterable, Tuple
+
+from sqlalchemy import and_, case, delete, func, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal
+from .models import entities
+
+UPSERT_CHUNK = 1000
+
+ReservationKey = Tuple[date, int, int]
+SalesKey = Tuple[date, int]
+
+
+def _count_status(status: entities.ReservationStatus):
+    return func.coalesce(func.sum(case((entities.Reservation.status == status, 1), else_=0)), 0)
+
+
+def _reservation_stats(*criteria):
+    reservation, stand, sale = entities.Reservation, entities.Stand, entities.Sale
+    return (
+        select(
+            reservation.reservation_date.label("day"),
+            stand.project_id,
+            reservation.realtor_id,
+            func.count(reservation.id).label("created"),
+            _count_status(entities.ReservationStatus.APPROVED).label("approved"),
+            _count_status(entities.ReservationStatus.REJECTED).label("rejected"),
+            _count_status(entities.ReservationStatus.EXPIRED).label("expired"),
+            func.count(sale.id).label("converted"),
+            func.coalesce(func.sum(sale.sale_price), 0).label("converted_value"),
+        )
+        .join(stand, stand.id == reservation.stand_id)
+        .outerjoin(
+            sale,
+            and_(
+                sale.stand_id == reservation.stand_id,
+                sale.status != entities.SaleStatus.CANCELLED,
+                reservation.status.in_([entities.ReservationStatus.PENDING, entities.ReservationStatus.APPROVED]),
+            ),
+        )
+        .where(*criteria)
+        .group_by(reservation.reservation_date, stand.project_id, reservation.realtor_id)
+    )
+
+
+def _sales_stats(*criteria):
+    sale, stand = entities.Sale, entities.Stand
+    return (
+        select(
+            sale.sale_date.label("day"),
+            stand.project_id,
+            func.count(sale.id).label("sales_count"),
+            func.coalesce(func.sum(sale.sale_price), 0).label("sales_value"),
+        )
+        .join(stand, stand.id == sale.stand_id)
+        .where(sale.status != entities.SaleStatus.CANCELLED, *criteria)
+        .group_by(sale.sale_date, stand.project_id)
+    )
+
+
+def _upsert(db: Session, model, rows: list[dict]) -> None:
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    keys = [column.name for column in model.__table__.primary_key]
+    for offset in range(0, len(rows), UPSERT_CHUNK):
+        statement = dialect.insert(model).values(rows[offset : offset + UPSERT_CHUNK])
+        values = {name: statement.excluded[name] for name in rows[0] if name not in keys}
+        db.execute(statement.on_conflict_do_update(index_elements=keys, set_=values))
+
+
+def _lock_buckets(db: Session, namespace: str, keys: set) -> None:
+    """Serialize refreshes of the same buckets across transactions.
+
+    Under READ COMMITTED two writers to one bucket would each aggregate without the other's uncommitted
+    row, and the later upsert would overwrite the earlier total. Holding a transaction-scoped lock per
+    bucket means the second writer aggregates only after the first has committed. Keys are locked in
+    sorted order so overlapping batches cannot deadlock. SQLite already serializes writers.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    for name in sorted(f"{namespace}:{':'.join(map(str, key))}" for key in keys):
+        db.execute(select(func.pg_advisory_xact_lock(func.hashtext(name))))
+
+
+def _replace(db: Session, model, key_columns, keys: set, stats) -> None:
+    rows = [dict(row) for row in db.execute(stats).mappings()]
+    _upsert(db, model, rows)
+    empty = keys - {tuple(row[column.name] for column in key_columns) for row in rows}
+    if empty:
+        db.execute(delete(model).where(tuple_(*key_columns).in_(empty)))
+
+
+def refresh_reservation_rollups(db: Session, keys: Iterable[ReservationKey]) -> None:
+    """Recompute the given (day, project, realtor) buckets inside the caller's transaction."""
+    keys = set(keys)
+    if not keys:
+        return
+    db.flush()
+    _lock_buckets(db, "rollup:reservations", keys)
+    rollup = entities.ReservationDailyRollup
+    stats = _reservation_stats(
+        tuple_(entities.Reservation.reservation_date, entities.Stand.project_id, entities.Reservation.realtor_id).in_(keys)
+    )
+    _replace(db, rollup, [rollup.day, rollup.project_id, rollup.realtor_id], keys, stats)
+
+
+def refresh_sales_rollups(db: Session, keys: Iterable[SalesKey]) -> None:
+    keys = set(keys)
+    if not keys:
+        return
+    db.flush()
+    _lock_buckets(db, "rollup:sales", keys)
+    rollup = entities.SalesDailyRollup
+    stats = _sales_stats(tuple_(entities.Sale.sale_date, entities.Stand.project_id).in_(keys))
+    _replace(db, rollup, [rollup.day, rollup.project_id], keys, stats)
+
+
+def refresh_stand_sale_rollups(db: Session, stand: entities.Stand, sale_date: date) -> None:
+    """A sale changes its own day bucket and the conversion counts of every reservation on the stand."""
+    db.flush()
+    reservation_keys = db.execute(
+        select(entities.Reservation.reservation_date, entities.Reservation.realtor_id)
+        .where(entities.Reservation.stand_id == stand.id)
+        .distinct()
+    ).all()
+    refresh_reservation_rollups(db, [(day, stand.project_id, realtor_id) for day, realtor_id in reservation_keys])
+    refresh_sales_rollups(db, [(sale_date, stand.project_id)])
+
+
+def backfill(db: Session, start: date, end: date) -> None:
+    """Rebuild every rollup row between ``start`` and ``end`` from the raw tables. Safe to re-run."""
+    reservation_rollup, sales_rollup = entities.ReservationDailyRollup, entities.SalesDailyRollup
+    db.execute(delete(reservation_rollup).where(reservation_rollup.day.between(start, end)))
+    db.execute(delete(sales_rollup).where(sales_rollup.day.between(start, end)))
+    _upsert(
+        db,
+        reservation_rollup,
+        [dict(row) for row in db.execute(_reservation_stats(entities.Reservation.reservation_date.between(start, end))).mappings()],
+    )
+    _upsert(
+        db,
+        sales_rollup,
+        [dict(row) for row in db.execute(_sales_stats(entities.Sale.sale_date.between(start, end))).mappings()],
+    )
+    db.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild daily reservation and sales rollups.")
+    parser.add_argument("--days", type=int, default=30, help="number of trailing days to rebuild")
+    parser.add_argument("--start", type=date.fromisoformat)
+    parser.add_argument("--end", type=date.fromisoformat)
+    args = parser.parse_args()
+    end = args.end or date.today()
+    start = args.start or end - timedelta(days=args.days)
+    with SessionLocal() as session:
+        backfill(session, start, end)
+    print(f"Rebuilt rollups from {start} to {end}")
@@ -6,4 +6,6 @@ __all__ = [
     "reservations",
     "sales",
     "payments",
+    "reports",
+    "jobs",
 ]
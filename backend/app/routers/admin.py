@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from ..dependencies import require_roles
+from ..dependencies import fields_response, require_roles, sparse_fields
 from ..database import get_db
 from ..models import entities
+from ..queries import all_rows
 from ..schemas.common import UserCreate, UserOut
+from ..core.cache import cache
+from ..core.profiling import profiles, slow_queries
 from ..core.security import get_password_hash
 
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -22,10 +25,42 @@ def create_user(payload: UserCreate, db: Session = Depends(get_db)):
     )
     db.add(user)
     db.commit()
+    cache.invalidate(f"user:{user.email}")
     db.refresh(user)
     return user
 
 
 @router.get("/users", response_model=list[UserOut], dependencies=[Depends(require_roles(["System Admin"]))])
-def list_users(db: Session = Depends(get_db)):
-    return db.query(entities.User).all()
+def list_users(fields: list[str] | None = Depends(sparse_fields(UserOut)), db: Session = Depends(get_db)):
+    if fields:
+        return fields_response(db, entities.User, fields)
+    return all_rows(db, entities.User)
+
+
+@router.get("/slow-queries", dependencies=[Depends(require_roles(["System Admin"]))])
+def list_slow_queries():
+    return list(reversed(slow_queries))
+
+
+@router.delete("/slow-queries", status_code=204, dependencies=[Depends(require_roles(["System Admin"]))])
+def clear_slow_queries():
+    slow_queries.clear()
+
+
+@router.get("/profiles", dependencies=[Depends(require_roles(["System Admin"]))])
+def list_profiles():
+    return [
+        {key: profile[key] for key in ("id", "route", "duration_ms", "samples")} for profile in reversed(profiles.values())
+    ]
+
+
+@router.get("/profiles/{profile_id}", dependencies=[Depends(require_roles(["System Admin"]))])
+def get_profile(profile_id: str):
+    if profile_id not in profiles:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profiles[profile_id]
+
+
+@router.get("/cache-stats", dependencies=[Depends(require_roles(["System Admin"]))])
+def cache_stats():
+    return cache.stats()
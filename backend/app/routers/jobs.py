@@ -0,0 +1,74 @@
+import os
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from ..dependencies import require_roles
+from ..database import get_db
+from ..jobs import job_types, runner
+from ..models import entities
+from ..queries import get_or_404, recent_jobs
+from ..schemas.common import JobCreate, JobOut
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+job_roles = require_roles(["System Admin", "Credit Manager", "Property Manager"])
+
+
+@router.post("", response_model=JobOut, status_code=202)
+def submit_job(payload: JobCreate, db: Session = Depends(get_db), current_user=Depends(job_roles)):
+    if payload.job_type not in job_types:
+        raise HTTPException(status_code=400, detail=f"Unknown job type: {payload.job_type}")
+    job = entities.Job(job_type=payload.job_type, params=payload.params, created_by=current_user.id)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    runner.wake()
+    return job
+
+
+@router.get("", response_model=list[JobOut], dependencies=[Depends(job_roles)])
+def list_jobs(db: Session = Depends(get_db)):
+    return recent_jobs(db)
+
+
+@router.get("/{job_id}", response_model=JobOut, dependencies=[Depends(job_roles)])
+def get_job(job_id: int, db: Session = Depends(get_db)):
+    return get_or_404(db, entities.Job, job_id, "Job not found")
+
+
+@router.post("/{job_id}/cancel", response_model=JobOut, dependencies=[Depends(job_roles)])
+def cancel_job(job_id: int, db: Session = Depends(get_db)):
+    job = get_or_404(db, entities.Job, job_id, "Job not found")
+    # Guarded updates, like the dispatcher's claim, so a job claimed in between is never overwritten.
+    cancelled = db.execute(
+        update(entities.Job)
+        .where(entities.Job.id == job_id, entities.Job.status == entities.JobStatus.PENDING)
+        .values(status=entities.JobStatus.CANCELLED, message="Cancelled", finished_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not cancelled:
+        # The job notices on its next progress report.
+        requested = db.execute(
+            update(entities.Job)
+            .where(entities.Job.id == job_id, entities.Job.status == entities.JobStatus.RUNNING)
+            .values(cancel_requested=True)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not requested:
+            db.rollback()
+            db.refresh(job)
+            raise HTTPException(status_code=409, detail=f"Job is already {job.status.value}")
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+@router.get("/{job_id}/download", dependencies=[Depends(job_roles)])
+def download_job_result(job_id: int, db: Session = Depends(get_db)):
+    job = get_or_404(db, entities.Job, job_id, "Job not found")
+    if job.status != entities.JobStatus.SUCCEEDED or not job.result_path or not os.path.exists(job.result_path):
+        raise HTTPException(status_code=404, detail="Job result not available")
+    return FileResponse(job.result_path, filename=os.path.basename(job.result_path))
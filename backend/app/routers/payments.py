@@ -1,23 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from ..dependencies import require_roles
+from ..dependencies import fields_response, require_roles, sparse_fields
 from ..database import get_db
 from ..models import entities
+from ..queries import all_rows, get_or_404
 from ..schemas.common import PaymentPlanCreate, PaymentPlanOut, PaymentCreate, PaymentOut
 
 router = APIRouter(prefix="/payments", tags=["payments"])
 
 @router.get("/plans", response_model=list[PaymentPlanOut], dependencies=[Depends(require_roles(["Credit Manager", "System Admin"]))])
-def list_payment_plans(db: Session = Depends(get_db)):
-    return db.query(entities.PaymentPlan).all()
+def list_payment_plans(fields: list[str] | None = Depends(sparse_fields(PaymentPlanOut)), db: Session = Depends(get_db)):
+    if fields:
+        return fields_response(db, entities.PaymentPlan, fields)
+    return all_rows(db, entities.PaymentPlan)
 
 
 @router.post("/plans", response_model=PaymentPlanOut, dependencies=[Depends(require_roles(["Credit Manager", "System Admin"]))])
 def create_payment_plan(payload: PaymentPlanCreate, db: Session = Depends(get_db)):
-    sale = db.query(entities.Sale).filter(entities.Sale.id == payload.sale_id).first()
-    if not sale:
-        raise HTTPException(status_code=404, detail="Sale not found")
+    sale = get_or_404(db, entities.Sale, payload.sale_id, "Sale not found")
     plan = entities.PaymentPlan(**payload.dict())
     db.add(plan)
     db.commit()
@@ -27,9 +28,7 @@ def create_payment_plan(payload: PaymentPlanCreate, db: Session = Depends(get_db
 
 @router.post("", response_model=PaymentOut, dependencies=[Depends(require_roles(["Credit Manager", "System Admin"]))])
 def record_payment(payload: PaymentCreate, db: Session = Depends(get_db)):
-    sale = db.query(entities.Sale).filter(entities.Sale.id == payload.sale_id).first()
-    if not sale:
-        raise HTTPException(status_code=404, detail="Sale not found")
+    sale = get_or_404(db, entities.Sale, payload.sale_id, "Sale not found")
     payment = entities.Payment(**payload.dict())
     db.add(payment)
     db.commit()
@@ -38,5 +37,7 @@ def record_payment(payload: PaymentCreate, db: Session = Depends(get_db)):
 
 
 @router.get("", response_model=list[PaymentOut], dependencies=[Depends(require_roles(["Credit Manager", "System Admin"]))])
-def list_payments(db: Session = Depends(get_db)):
-    return db.query(entities.Payment).all()
+def list_payments(fields: list[str] | None = Depends(sparse_fields(PaymentOut)), db: Session = Depends(get_db)):
+    if fields:
+        return fields_response(db, entities.Payment, fields)
+    return all_rows(db, entities.Payment)
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
-from ..dependencies import require_roles
+from ..analytics import project_analytics
+from ..core.cache import cache
+from ..dependencies import fields_response, require_roles, sparse_fields
 from ..database import get_db
 from ..models import entities
-from ..schemas.common import ProjectCreate, ProjectOut
+from ..queries import all_rows, get_or_404
+from ..schemas.common import ProjectAnalytics, ProjectCreate, ProjectOut
 
 router = APIRouter(prefix="/projects", tags=["projects"], dependencies=[Depends(require_roles(["System Admin", "Property Manager"]))])
 
@@ -14,10 +17,21 @@ def create_project(payload: ProjectCreate, db: Session = Depends(get_db)):
     project = entities.Project(**payload.dict())
     db.add(project)
     db.commit()
+    cache.invalidate("projects:list")
     db.refresh(project)
     return project
 
 
 @router.get("", response_model=list[ProjectOut])
-def list_projects(db: Session = Depends(get_db)):
-    return db.query(entities.Project).all()
+def list_projects(fields: list[str] | None = Depends(sparse_fields(ProjectOut)), db: Session = Depends(get_db)):
+    if fields:
+        return fields_response(db, entities.Project, fields)
+    return cache.get_or_load(
+        "projects:list", lambda: [ProjectOut.from_orm(project).dict() for project in all_rows(db, entities.Project)]
+    )
+
+
+@router.get("/{project_id}/analytics", response_model=ProjectAnalytics)
+def get_project_analytics(project_id: int, bins: int = Query(10, ge=1, le=100), db: Session = Depends(get_db)):
+    get_or_404(db, entities.Project, project_id, "Project not found")
+    return project_analytics(db, project_id, bins)
@@ -0,0 +1,68 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..dependencies import require_roles
+from ..database import get_db
+from ..models import entities
+from ..schemas.common import DailyReportRow
+
+router = APIRouter(prefix="/reports", tags=["reports"], dependencies=[Depends(require_roles(["System Admin", "Property Manager"]))])
+
+GROUPINGS = {"day": "day", "project": "project_id", "realtor": "realtor_id"}
+
+
+@router.get("/daily", response_model=list[DailyReportRow])
+def daily_report(
+    start: date,
+    end: date,
+    group_by: list[str] = Query(["day"]),
+    project_id: int | None = None,
+    realtor_id: int | None = None,
+    db: Session = Depends(get_db),
+):
+    unknown = [name for name in group_by if name not in GROUPINGS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown grouping: {', '.join(unknown)}")
+    dimensions = [GROUPINGS[name] for name in dict.fromkeys(group_by)]
+
+    reservations = entities.ReservationDailyRollup
+    criteria = [reservations.day.between(start, end)]
+    if project_id is not None:
+        criteria.append(reservations.project_id == project_id)
+    if realtor_id is not None:
+        criteria.append(reservations.realtor_id == realtor_id)
+    counters = ["created", "approved", "rejected", "expired", "converted", "converted_value"]
+    rows = {}
+    for row in db.execute(
+        select(
+            *[getattr(reservations, name) for name in dimensions],
+            *[func.sum(getattr(reservations, name)).label(name) for name in counters],
+        )
+        .where(*criteria)
+        .group_by(*[getattr(reservations, name) for name in dimensions])
+    ).mappings():
+        rows[tuple(row[name] for name in dimensions)] = dict(row)
+
+    # Sales are not attributed to a realtor, so they are only reported for realtor-free groupings.
+    if "realtor_id" not in dimensions and realtor_id is None:
+        sales = entities.SalesDailyRollup
+        criteria = [sales.day.between(start, end)]
+        if project_id is not None:
+            criteria.append(sales.project_id == project_id)
+        for row in db.execute(
+            select(
+                *[getattr(sales, name) for name in dimensions],
+                func.sum(sales.sales_count).label("sales_count"),
+                func.sum(sales.sales_value).label("sales_value"),
+            )
+            .where(*criteria)
+            .group_by(*[getattr(sales, name) for name in dimensions])
+        ).mappings():
+            rows.setdefault(tuple(row[name] for name in dimensions), {}).update(row)
+        for row in rows.values():
+            row.setdefault("sales_count", 0)
+            row.setdefault("sales_value", 0)
+    return [DailyReportRow(**row) for _, row in sorted(rows.items(), key=lambda item: [str(value) for value in item[0]])]
@@ -1,70 +1,160 @@
 from datetime import date
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
-from ..dependencies import get_current_user, require_roles
+from ..analytics import invalidate_project_analytics
+from ..dependencies import fields_response, get_current_user, require_roles, sparse_fields
 from ..database import get_db
 from ..models import entities
-from ..schemas.common import ReservationCreate, ReservationOut
+from ..queries import STAND_HELD, all_rows, get_or_404, reservations_for_realtor
+from ..rollups import refresh_reservation_rollups
+from ..schemas.common import BatchIds, BatchOutcome, ReservationCreate, ReservationOut
 
 router = APIRouter(prefix="/reservations", tags=["reservations"])
 
+BATCH_TRANSITIONS = {
+    "approve": (entities.ReservationStatus.APPROVED, entities.StandStatus.RESERVED, [entities.ReservationStatus.PENDING]),
+    "reject": (entities.ReservationStatus.REJECTED, entities.StandStatus.AVAILABLE, [entities.ReservationStatus.PENDING]),
+    "expire": (
+        entities.ReservationStatus.EXPIRED,
+        entities.StandStatus.AVAILABLE,
+        [entities.ReservationStatus.PENDING, entities.ReservationStatus.APPROVED],
+    ),
+}
+
 
 @router.post("", response_model=ReservationOut, dependencies=[Depends(require_roles(["Realtor", "Property Manager", "System Admin"]))])
 def create_reservation(payload: ReservationCreate, db: Session = Depends(get_db)):
-    stand = db.query(entities.Stand).filter(entities.Stand.id == payload.stand_id).first()
-    if not stand:
-        raise HTTPException(status_code=404, detail="Stand not found")
+    stand = get_or_404(db, entities.Stand, payload.stand_id, "Stand not found")
     if stand.status != entities.StandStatus.AVAILABLE:
         raise HTTPException(status_code=400, detail="Stand not available")
     reservation = entities.Reservation(**payload.dict())
     stand.status = entities.StandStatus.RESERVED
     db.add(reservation)
+    refresh_reservation_rollups(db, [(reservation.reservation_date, stand.project_id, reservation.realtor_id)])
     db.commit()
+    invalidate_project_analytics(stand.project_id)
     db.refresh(reservation)
     return reservation
 
 
 @router.get("", response_model=list[ReservationOut])
-def list_reservations(db: Session = Depends(get_db), current_user=Depends(get_current_user)):
-    query = db.query(entities.Reservation)
-    if current_user.role == "Realtor":
-        query = query.filter(entities.Reservation.realtor_id == current_user.id)
-    return query.all()
+def list_reservations(
+    fields: list[str] | None = Depends(sparse_fields(ReservationOut)),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    realtor_only = current_user.role == "Realtor"
+    if fields:
+        criteria = [entities.Reservation.realtor_id == current_user.id] if realtor_only else []
+        return fields_response(db, entities.Reservation, fields, *criteria)
+    if realtor_only:
+        return reservations_for_realtor(db, current_user.id)
+    return all_rows(db, entities.Reservation)
+
+
+@router.post("/batch/{action}", response_model=list[BatchOutcome], dependencies=[Depends(require_roles(["Property Manager", "System Admin"]))])
+def batch_transition_reservations(action: str, payload: BatchIds, db: Session = Depends(get_db)):
+    if action not in BATCH_TRANSITIONS:
+        raise HTTPException(status_code=404, detail="Unknown reservation action")
+    reservation_status, stand_status, source_statuses = BATCH_TRANSITIONS[action]
+    ids = list(dict.fromkeys(payload.ids))
+    rows = db.execute(
+        select(
+            entities.Reservation.id,
+            entities.Reservation.stand_id,
+            entities.Reservation.reservation_date,
+            entities.Reservation.realtor_id,
+            entities.Reservation.status,
+            entities.Stand.project_id,
+        )
+        .join(entities.Stand, entities.Stand.id == entities.Reservation.stand_id)
+        .where(entities.Reservation.id.in_(ids))
+    ).all()
+    found = {row.id: row for row in rows}
+    updated = set()
+    if found:
+        values = {"status": reservation_status}
+        if action == "expire":
+            values["expiry_date"] = date.today()
+        guards = []
+        if stand_status == entities.StandStatus.RESERVED:
+            # A sold stand cannot be held, so approving its reservation is a conflict rather than a no-op update.
+            guards.append(
+                entities.Reservation.stand_id.notin_(
+                    select(entities.Stand.id).where(entities.Stand.status == entities.StandStatus.SOLD)
+                )
+            )
+        # The source-status guard makes the transition atomic against concurrent single-id transitions.
+        updated = set(
+            db.execute(
+                update(entities.Reservation)
+                .where(entities.Reservation.id.in_(found), entities.Reservation.status.in_(source_statuses), *guards)
+                .values(**values)
+                .returning(entities.Reservation.id)
+                .execution_options(synchronize_session=False)
+            ).scalars()
+        )
+    if updated:
+        stand_ids = {found[reservation_id].stand_id for reservation_id in updated}
+        stands = update(entities.Stand).where(entities.Stand.id.in_(stand_ids), entities.Stand.status != entities.StandStatus.SOLD)
+        if stand_status == entities.StandStatus.AVAILABLE:
+            # Another pending or approved reservation may still hold the stand.
+            stands = stands.where(~STAND_HELD)
+        db.execute(stands.values(status=stand_status).execution_options(synchronize_session=False))
+        changed = [found[reservation_id] for reservation_id in updated]
+        refresh_reservation_rollups(db, [(row.reservation_date, row.project_id, row.realtor_id) for row in changed])
+        db.commit()
+        invalidate_project_analytics(*{row.project_id for row in changed})
+    return [
+        BatchOutcome(id=reservation_id, outcome="updated", status=reservation_status.value)
+        if reservation_id in updated
+        else BatchOutcome(id=reservation_id, outcome="conflict", status=found[reservation_id].status.value)
+        if reservation_id in found
+        else BatchOutcome(id=reservation_id, outcome="not_found")
+        for reservation_id in ids
+    ]
 
 
 @router.post("/{reservation_id}/approve", response_model=ReservationOut, dependencies=[Depends(require_roles(["Property Manager", "System Admin"]))])
 def approve_reservation(reservation_id: int, db: Session = Depends(get_db)):
-    reservation = db.query(entities.Reservation).filter(entities.Reservation.id == reservation_id).first()
-    if not reservation:
-        raise HTTPException(status_code=404, detail="Reservation not found")
+    reservation = get_or_404(db, entities.Reservation, reservation_id, "Reservation not found")
     reservation.status = entities.ReservationStatus.APPROVED
     reservation.stand.status = entities.StandStatus.RESERVED
+    refresh_reservation_rollups(
+        db, [(reservation.reservation_date, reservation.stand.project_id, reservation.realtor_id)]
+    )
     db.commit()
+    invalidate_project_analytics(reservation.stand.project_id)
     db.refresh(reservation)
     return reservation
 
 
 @router.post("/{reservation_id}/reject", response_model=ReservationOut, dependencies=[Depends(require_roles(["Property Manager", "System Admin"]))])
 def reject_reservation(reservation_id: int, db: Session = Depends(get_db)):
-    reservation = db.query(entities.Reservation).filter(entities.Reservation.id == reservation_id).first()
-    if not reservation:
-        raise HTTPException(status_code=404, detail="Reservation not found")
+    reservation = get_or_404(db, entities.Reservation, reservation_id, "Reservation not found")
     reservation.status = entities.ReservationStatus.REJECTED
     reservation.stand.status = entities.StandStatus.AVAILABLE
+    refresh_reservation_rollups(
+        db, [(reservation.reservation_date, reservation.stand.project_id, reservation.realtor_id)]
+    )
     db.commit()
+    invalidate_project_analytics(reservation.stand.project_id)
     db.refresh(reservation)
     return reservation
 
 
 @router.post("/{reservation_id}/expire", response_model=ReservationOut, dependencies=[Depends(require_roles(["Property Manager", "System Admin"]))])
 def expire_reservation(reservation_id: int, db: Session = Depends(get_db)):
-    reservation = db.query(entities.Reservation).filter(entities.Reservation.id == reservation_id).first()
-    if not reservation:
-        raise HTTPException(status_code=404, detail="Reservation not found")
+    reservation = get_or_404(db, entities.Reservation, reservation_id, "Reservation not found")
     reservation.status = entities.ReservationStatus.EXPIRED
     reservation.stand.status = entities.StandStatus.AVAILABLE
     reservation.expiry_date = date.today()
+    refresh_reservation_rollups(
+        db, [(reservation.reservation_date, reservation.stand.project_id, reservation.realtor_id)]
+    )
     db.commit()
+    invalidate_project_analytics(reservation.stand.project_id)
     db.refresh(reservation)
     return reservation
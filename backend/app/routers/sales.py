@@ -1,39 +1,42 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from ..dependencies import require_roles
+from ..analytics import invalidate_project_analytics
+from ..dependencies import fields_response, require_roles, sparse_fields
 from ..database import get_db
 from ..models import entities
+from ..queries import all_rows, get_or_404
+from ..rollups import refresh_stand_sale_rollups
 from ..schemas.common import SaleCreate, SaleOut
 
 router = APIRouter(prefix="/sales", tags=["sales"])
 
 
 @router.get("", response_model=list[SaleOut], dependencies=[Depends(require_roles(["Property Manager", "Credit Manager", "System Admin"]))])
-def list_sales(db: Session = Depends(get_db)):
-    return db.query(entities.Sale).all()
+def list_sales(fields: list[str] | None = Depends(sparse_fields(SaleOut)), db: Session = Depends(get_db)):
+    if fields:
+        return fields_response(db, entities.Sale, fields)
+    return all_rows(db, entities.Sale)
 
 
 @router.post("", response_model=SaleOut, dependencies=[Depends(require_roles(["Property Manager", "System Admin"]))])
 def create_sale(payload: SaleCreate, db: Session = Depends(get_db)):
-    stand = db.query(entities.Stand).filter(entities.Stand.id == payload.stand_id).first()
-    if not stand:
-        raise HTTPException(status_code=404, detail="Stand not found")
+    stand = get_or_404(db, entities.Stand, payload.stand_id, "Stand not found")
     if stand.status not in [entities.StandStatus.AVAILABLE, entities.StandStatus.RESERVED]:
         raise HTTPException(status_code=400, detail="Stand cannot be sold")
     sale = entities.Sale(**payload.dict())
     stand.status = entities.StandStatus.SOLD
     db.add(sale)
+    refresh_stand_sale_rollups(db, stand, sale.sale_date)
     db.commit()
+    invalidate_project_analytics(stand.project_id)
     db.refresh(sale)
     return sale
 
 
 @router.post("/{sale_id}/complete", response_model=SaleOut, dependencies=[Depends(require_roles(["Credit Manager", "System Admin"]))])
 def complete_sale(sale_id: int, db: Session = Depends(get_db)):
-    sale = db.query(entities.Sale).filter(entities.Sale.id == sale_id).first()
-    if not sale:
-        raise HTTPException(status_code=404, detail="Sale not found")
+    sale = get_or_404(db, entities.Sale, sale_id, "Sale not found")
     sale.status = entities.SaleStatus.COMPLETED
     db.commit()
     db.refresh(sale)
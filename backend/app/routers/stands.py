@@ -1,38 +1,265 @@
-from fastapi import APIRouter, Depends, HTTPException
+from collections import Counter
+from decimal import Decimal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, func, select, update
 from sqlalchemy.orm import Session
 
-from ..dependencies import get_current_user, require_roles
+from ..analytics import invalidate_project_analytics
+from ..core.config import get_settings
+from ..dependencies import fields_response, get_current_user, require_roles, sparse_fields
 from ..database import get_db
+from ..geometry import ring_bounds, ring_centroid, simplify_ring, tile_tolerance
 from ..models import entities
-from ..schemas.common import StandCreate, StandOut
+from ..queries import STAND_HELD, all_rows, get_or_404
+from ..schemas.common import (
+    BatchOutcome,
+    PriceBucket,
+    StandBatchStatus,
+    StandCreate,
+    StandFacets,
+    StandGeometryImport,
+    StandGeometryImportResult,
+    StandMapFeature,
+    StandOut,
+    StandSearchResult,
+)
 
 router = APIRouter(prefix="/stands", tags=["stands"])
+settings = get_settings()
+
+SEARCH_SORTS = {
+    "id": entities.Stand.id,
+    "stand_number": entities.Stand.stand_number,
+    "price": entities.Stand.price,
+    "size_m2": entities.Stand.size_m2,
+}
 
 
 @router.get("", response_model=list[StandOut])
-def list_stands(db: Session = Depends(get_db), current_user=Depends(get_current_user)):
-    return db.query(entities.Stand).all()
+def list_stands(
+    fields: list[str] | None = Depends(sparse_fields(StandOut)),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    if fields:
+        return fields_response(db, entities.Stand, fields)
+    return all_rows(db, entities.Stand)
+
+
+@router.get("/search", response_model=StandSearchResult)
+def search_stands(
+    project_id: list[int] | None = Query(None),
+    status: list[str] | None = Query(None),
+    min_price: Decimal | None = None,
+    max_price: Decimal | None = None,
+    min_size: Decimal | None = None,
+    max_size: Decimal | None = None,
+    sort: str = "id",
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    price_bucket: Decimal = Query(Decimal("10000"), gt=0),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    stand = entities.Stand
+    criteria = []
+    if project_id:
+        criteria.append(stand.project_id.in_(project_id))
+    if status:
+        try:
+            criteria.append(stand.status.in_([entities.StandStatus(value) for value in status]))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Unknown stand status")
+    if min_price is not None:
+        criteria.append(stand.price >= min_price)
+    if max_price is not None:
+        criteria.append(stand.price <= max_price)
+    if min_size is not None:
+        criteria.append(stand.size_m2 >= min_size)
+    if max_size is not None:
+        criteria.append(stand.size_m2 <= max_size)
+    sort_column = SEARCH_SORTS.get(sort.lstrip("-"))
+    if sort_column is None:
+        raise HTTPException(status_code=400, detail=f"Unknown sort field: {sort}")
+
+    # One grouped pass yields every (status, project, price bucket) cell; the facets are folded from those.
+    bucket = func.floor(stand.price / price_bucket).label("bucket")
+    cells = db.execute(
+        select(stand.status, stand.project_id, bucket, func.count())
+        .where(*criteria)
+        .group_by(stand.status, stand.project_id, bucket)
+    ).all()
+    by_status, by_project, by_bucket = Counter(), Counter(), Counter()
+    for cell_status, cell_project, cell_bucket, count in cells:
+        by_status[cell_status.value] += count
+        by_project[cell_project] += count
+        by_bucket[int(cell_bucket)] += count
+
+    items = db.execute(
+        select(stand)
+        .where(*criteria)
+        .order_by(sort_column.desc() if sort.startswith("-") else sort_column, stand.id)
+        .limit(limit)
+        .offset(offset)
+    ).scalars().all()
+    return StandSearchResult(
+        total=sum(by_status.values()),
+        items=items,
+        facets=StandFacets(
+            status=dict(by_status),
+            project=dict(by_project),
+            price=[
+                PriceBucket(min=index * price_bucket, max=(index + 1) * price_bucket, count=by_bucket[index])
+                for index in sorted(by_bucket)
+            ],
+        ),
+    )
+
+
+@router.get("/viewport", response_model=list[StandMapFeature])
+def stands_in_viewport(
+    min_x: float,
+    min_y: float,
+    max_x: float,
+    max_y: float,
+    zoom: int = Query(15, ge=0, le=24),
+    project_id: int | None = None,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    stand = entities.Stand
+    if db.get_bind().dialect.name == "postgresql":
+        # Matches the ix_stands_bbox GiST expression index.
+        overlaps = func.box(func.point(stand.min_x, stand.min_y), func.point(stand.max_x, stand.max_y)).op("&&")(
+            func.box(func.point(min_x, min_y), func.point(max_x, max_y))
+        )
+    else:
+        overlaps = and_(stand.min_x <= max_x, stand.max_x >= min_x, stand.min_y <= max_y, stand.max_y >= min_y)
+    criteria = [overlaps]
+    if project_id is not None:
+        criteria.append(stand.project_id == project_id)
+    with_polygons = zoom >= settings.map_polygon_min_zoom
+    columns = [stand.id, stand.stand_number, stand.status, stand.price, stand.centroid_x, stand.centroid_y]
+    if with_polygons:
+        columns.append(stand.geometry)
+    rows = db.execute(select(*columns).where(*criteria)).all()
+    tolerance = tile_tolerance(zoom)
+    return [
+        StandMapFeature(
+            id=row.id,
+            stand_number=row.stand_number,
+            status=row.status.value,
+            price=row.price,
+            centroid=(row.centroid_x, row.centroid_y),
+            geometry=[simplify_ring(ring, tolerance) for ring in row.geometry] if with_polygons else None,
+        )
+        for row in rows
+    ]
+
+
+@router.post("/geometry/import", response_model=StandGeometryImportResult, dependencies=[Depends(require_roles(["System Admin", "Property Manager"]))])
+def import_stand_geometry(payload: StandGeometryImport, db: Session = Depends(get_db)):
+    stand_ids = dict(
+        db.execute(
+            select(entities.Stand.stand_number, entities.Stand.id).where(entities.Stand.project_id == payload.project_id)
+        ).all()
+    )
+    updates, unmatched = [], []
+    for feature in payload.features:
+        stand_number = str(feature.properties.get("stand_number", ""))
+        if stand_number not in stand_ids:
+            unmatched.append(stand_number)
+            continue
+        rings = [[list(point) for point in ring] for ring in feature.geometry.coordinates]
+        if not rings or len(rings[0]) < 4:
+            raise HTTPException(status_code=400, detail=f"Stand {stand_number} geometry is not a polygon")
+        min_x, min_y, max_x, max_y = ring_bounds(rings[0])
+        centroid_x, centroid_y = ring_centroid(rings[0])
+        updates.append(
+            {
+                "id": stand_ids[stand_number],
+                "geometry": rings,
+                "centroid_x": centroid_x,
+                "centroid_y": centroid_y,
+                "min_x": min_x,
+                "min_y": min_y,
+                "max_x": max_x,
+                "max_y": max_y,
+            }
+        )
+    if updates:
+        db.execute(update(entities.Stand), updates)
+        db.commit()
+    return StandGeometryImportResult(updated=len(updates), unmatched=unmatched)
 
 
 @router.post("", response_model=StandOut, dependencies=[Depends(require_roles(["System Admin", "Property Manager"]))])
 def create_stand(payload: StandCreate, db: Session = Depends(get_db)):
-    project = db.query(entities.Project).filter(entities.Project.id == payload.project_id).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    project = get_or_404(db, entities.Project, payload.project_id, "Project not found")
     stand = entities.Stand(**payload.dict())
     db.add(stand)
     db.commit()
+    invalidate_project_analytics(stand.project_id)
     db.refresh(stand)
     return stand
 
 
 @router.put("/{stand_id}", response_model=StandOut, dependencies=[Depends(require_roles(["System Admin", "Property Manager"]))])
 def update_stand(stand_id: int, payload: StandCreate, db: Session = Depends(get_db)):
-    stand = db.query(entities.Stand).filter(entities.Stand.id == stand_id).first()
-    if not stand:
-        raise HTTPException(status_code=404, detail="Stand not found")
+    stand = get_or_404(db, entities.Stand, stand_id, "Stand not found")
+    previous_project_id = stand.project_id
     for key, value in payload.dict().items():
         setattr(stand, key, value)
     db.commit()
+    invalidate_project_analytics(previous_project_id, payload.project_id)
     db.refresh(stand)
     return stand
+
+
+@router.post("/batch/status", response_model=list[BatchOutcome], dependencies=[Depends(require_roles(["System Admin", "Property Manager"]))])
+def batch_update_stand_status(payload: StandBatchStatus, db: Session = Depends(get_db)):
+    try:
+        new_status = entities.StandStatus(payload.status)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Unknown stand status")
+    if new_status == entities.StandStatus.SOLD:
+        raise HTTPException(status_code=400, detail="Stands are marked sold by recording a sale")
+    if payload.ids is None and payload.project_id is None:
+        raise HTTPException(status_code=400, detail="Provide ids or project_id")
+    # Sold stands and stands held by a pending or approved reservation are left alone and reported as conflicts.
+    statement = update(entities.Stand).where(entities.Stand.status != entities.StandStatus.SOLD, ~STAND_HELD)
+    if payload.ids is not None:
+        statement = statement.where(entities.Stand.id.in_(payload.ids))
+    if payload.project_id is not None:
+        statement = statement.where(entities.Stand.project_id == payload.project_id)
+    rows = db.execute(
+        statement.values(status=new_status)
+        .returning(entities.Stand.id, entities.Stand.project_id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+    invalidate_project_analytics(*{row.project_id for row in rows})
+    updated = [row.id for row in rows]
+    updated_ids = set(updated)
+    outcomes = [BatchOutcome(id=stand_id, outcome="updated", status=new_status.value) for stand_id in sorted(updated)]
+    if payload.ids is not None:
+        remaining = [stand_id for stand_id in dict.fromkeys(payload.ids) if stand_id not in updated_ids]
+        skipped = entities.Stand.id.in_(remaining)
+    else:
+        remaining = None
+        skipped = and_(entities.Stand.project_id == payload.project_id, entities.Stand.id.notin_(updated_ids))
+    current = {}
+    if remaining is None or remaining:
+        current = dict(
+            db.execute(
+                select(entities.Stand.id, entities.Stand.status).where(skipped).order_by(entities.Stand.id)
+            ).all()
+        )
+    outcomes.extend(
+        BatchOutcome(id=stand_id, outcome="conflict", status=current[stand_id].value)
+        if stand_id in current
+        else BatchOutcome(id=stand_id, outcome="not_found")
+        for stand_id in (current if remaining is None else remaining)
+    )
+    return outcomes
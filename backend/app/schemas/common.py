@@ -1,6 +1,6 @@
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 from pydantic import BaseModel, EmailStr
 
 
@@ -64,6 +64,113 @@ class StandOut(StandBase):
         orm_mode = True
 
 
+class PriceBucket(BaseModel):
+    min: Decimal
+    max: Decimal
+    count: int
+
+
+class StandFacets(BaseModel):
+    status: Dict[str, int]
+    project: Dict[int, int]
+    price: List[PriceBucket]
+
+
+class StandSearchResult(BaseModel):
+    total: int
+    items: List[StandOut]
+    facets: StandFacets
+
+
+class GeoJSONPolygon(BaseModel):
+    type: str = "Polygon"
+    coordinates: List[List[Tuple[float, float]]]
+
+
+class GeoJSONFeature(BaseModel):
+    properties: Dict[str, Any]
+    geometry: GeoJSONPolygon
+
+
+class StandGeometryImport(BaseModel):
+    project_id: int
+    features: List[GeoJSONFeature]
+
+
+class StandGeometryImportResult(BaseModel):
+    updated: int
+    unmatched: List[str]
+
+
+class StandMapFeature(BaseModel):
+    id: int
+    stand_number: str
+    status: str
+    price: Decimal
+    centroid: Tuple[float, float]
+    geometry: Optional[List[List[Tuple[float, float]]]] = None
+
+
+class PricePerM2Stats(BaseModel):
+    min: float
+    median: float
+    p90: float
+    max: float
+
+
+class HistogramBin(BaseModel):
+    min: float
+    max: float
+    count: int
+
+
+class ProjectAnalytics(BaseModel):
+    project_id: int
+    stand_count: int
+    price_per_m2: Optional[PricePerM2Stats] = None
+    histogram: List[HistogramBin]
+    sold_value: float
+    remaining_value: float
+    value_by_status: Dict[str, float]
+
+
+class DailyReportRow(BaseModel):
+    day: Optional[date] = None
+    project_id: Optional[int] = None
+    realtor_id: Optional[int] = None
+    created: int = 0
+    approved: int = 0
+    rejected: int = 0
+    expired: int = 0
+    converted: int = 0
+    converted_value: Decimal = Decimal(0)
+    sales_count: Optional[int] = None
+    sales_value: Optional[Decimal] = None
+
+
+class JobCreate(BaseModel):
+    job_type: str
+    params: Dict[str, Any] = {}
+
+
+class JobOut(BaseModel):
+    id: int
+    job_type: str
+    params: Optional[Dict[str, Any]] = None
+    status: str
+    progress: float
+    message: Optional[str] = None
+    cancel_requested: bool
+    error: Optional[str] = None
+    created_by: Optional[int] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+
 class ClientBase(BaseModel):
     full_name: str
     national_id: str
@@ -174,3 +281,19 @@ class AuditLogOut(BaseModel):
 
     class Config:
         orm_mode = True
+
+
+class BatchIds(BaseModel):
+    ids: List[int]
+
+
+class StandBatchStatus(BaseModel):
+    status: str
+    ids: Optional[List[int]] = None
+    project_id: Optional[int] = None
+
+
+class BatchOutcome(BaseModel):
+    id: int
+    outcome: str
+    status: Optional[str] = None
@@ -3,12 +3,13 @@ from sqlalchemy.orm import Session
 from .core.security import get_password_hash
 from .database import SessionLocal, engine, Base
 from .models import entities
+from .queries import user_by_email
 
 
 def seed_admin():
     Base.metadata.create_all(bind=engine)
     db: Session = SessionLocal()
-    existing = db.query(entities.User).filter(entities.User.email == "admin@stands.local").first()
+    existing = user_by_email(db, "admin@stands.local")
     if existing:
         print("Admin already exists")
         return
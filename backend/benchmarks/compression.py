@@ -0,0 +1,88 @@
+"""Transfer size and CPU cost of each response encoding on inventory- and ledger-shaped JSON.
+
+Run from ``backend/``: ``python -m benchmarks.compression [--rows N]``. Encodings whose optional
+package is not installed are skipped. "streamed" feeds the body in 64 KiB chunks with a flush after
+each, as the middleware does for streaming responses.
+"""
+import argparse
+import json
+import random
+import time
+from datetime import date, timedelta
+
+from app.core.compression import encoders
+
+STREAM_CHUNK = 64 * 1024
+
+
+def stands_payload(rows: int) -> bytes:
+    statuses = ["AVAILABLE", "RESERVED", "SOLD", "BLOCKED"]
+    return json.dumps(
+        [
+            {
+                "project_id": 1 + number % 12,
+                "stand_number": f"ST-{number:05d}",
+                "size_m2": f"{random.randint(200, 2000)}.00",
+                "price": f"{random.randint(5, 120) * 1000}.00",
+                "status": random.choice(statuses),
+                "id": number,
+            }
+            for number in range(1, rows + 1)
+        ]
+    ).encode()
+
+
+def payments_payload(rows: int) -> bytes:
+    start = date(2023, 1, 1)
+    return json.dumps(
+        [
+            {
+                "sale_id": random.randint(1, rows // 10 + 1),
+                "amount": f"{random.randint(50, 5000)}.00",
+                "date": (start + timedelta(days=random.randint(0, 700))).isoformat(),
+                "method": random.choice(["cash", "bank_transfer", "mobile_money"]),
+                "reference": f"REF{random.randint(100000, 999999)}",
+                "id": number,
+            }
+            for number in range(1, rows + 1)
+        ]
+    ).encode()
+
+
+def encode(name: str, body: bytes, streamed: bool) -> bytes:
+    encoder = encoders[name]()
+    if not streamed:
+        return encoder.compress(body) + encoder.finish()
+    chunks = [body[offset : offset + STREAM_CHUNK] for offset in range(0, len(body), STREAM_CHUNK)]
+    parts = [encoder.compress(chunk) + encoder.flush() for chunk in chunks[:-1]]
+    return b"".join(parts) + encoder.compress(chunks[-1]) + encoder.finish()
+
+
+def measure(name: str, body: bytes, streamed: bool, repeat: int = 5) -> tuple:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.process_time()
+        payload = encode(name, body, streamed)
+        best = min(best, time.process_time() - started)
+    return len(payload), best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+    random.seed(0)
+    payloads = {"stands": stands_payload(args.rows), "payments": payments_payload(args.rows)}
+    print(f"{'payload':<10}{'encoding':<10}{'mode':<10}{'bytes':>12}{'ratio':>8}{'cpu ms':>10}{'MB/s':>9}")
+    for label, body in payloads.items():
+        print(f"{label:<10}{'identity':<10}{'-':<10}{len(body):>12}{1.0:>8.2f}{0.0:>10.1f}{'-':>9}")
+        for name in encoders:
+            for streamed in (False, True):
+                size, cpu = measure(name, body, streamed)
+                throughput = len(body) / cpu / 1e6 if cpu else float("inf")
+                mode = "streamed" if streamed else "buffered"
+                print(f"{'':<10}{name:<10}{mode:<10}{size:>12}{len(body) / size:>8.2f}{cpu * 1000:>10.1f}{throughput:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Per-lookup Python overhead of legacy ``Query`` calls versus the shared statements in ``app.queries``.
+
+Run from ``backend/``: ``python -m benchmarks.lookups [--iterations N]``. Uses a throwaway SQLite
+file so the numbers are dominated by statement construction and compilation, not the database.
+"""
+import argparse
+import os
+import tempfile
+import timeit
+
+DATABASE_PATH = os.path.join(tempfile.mkdtemp(), "lookups.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{DATABASE_PATH}")
+
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app import queries  # noqa: E402
+from app.database import Base, engine  # noqa: E402
+from app.models import entities  # noqa: E402
+
+EMAIL = "bench@stands.local"
+STAND_ID = 50
+
+
+def seed() -> None:
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(entities.Project(name="Bench", location="Bench"))
+        db.flush()
+        db.add_all(
+            entities.Stand(project_id=1, stand_number=str(number), size_m2=100, price=1000, status=entities.StandStatus.AVAILABLE)
+            for number in range(100)
+        )
+        db.add(entities.User(name="Bench", email=EMAIL, role="System Admin", password_hash="-", active=True))
+        db.commit()
+
+
+CASES = {
+    "stand by id (legacy query)": lambda db: db.query(entities.Stand).filter(entities.Stand.id == STAND_ID).first(),
+    "stand by id (Session.get)": lambda db: db.get(entities.Stand, STAND_ID),
+    "user by email (legacy query)": lambda db: db.query(entities.User)
+    .filter(entities.User.email == EMAIL, entities.User.active == True)
+    .first(),
+    "user by email (prebuilt select)": lambda db: queries.user_by_email(db, EMAIL, active_only=True),
+}
+
+
+def measure(lookup, iterations: int, repeat_in_session: int) -> float:
+    """Microseconds per lookup; each session stands in for one request."""
+
+    def request():
+        with Session(engine) as db:
+            for _ in range(repeat_in_session):
+                lookup(db)
+
+    best = min(timeit.repeat(request, number=iterations, repeat=3))
+    return best / (iterations * repeat_in_session) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=3000)
+    args = parser.parse_args()
+    seed()
+    print(f"{'lookup':<34}{'1 per request':>16}{'3 per request':>16}")
+    for name, lookup in CASES.items():
+        single = measure(lookup, args.iterations, 1)
+        repeated = measure(lookup, args.iterations, 3)
+        print(f"{name:<34}{single:>13.1f} us{repeated:>13.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Client statement throughput against worker process count.
+
+Run from ``backend/``: ``python -m benchmarks.statements [--clients N] [--processes 1 2 4]``. Seeds a
+throwaway SQLite file (two sales and twenty payments per client by default) and runs the same
+``generate_statements`` pipeline the ``client_statements`` job uses.
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+DATABASE_PATH = os.path.join(tempfile.mkdtemp(), "statements.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{DATABASE_PATH}")
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.database import Base, engine  # noqa: E402
+from app.jobs.statements import generate_statements  # noqa: E402
+from app.models import entities  # noqa: E402
+
+PERIOD_END = date(2024, 12, 31)
+
+
+def seed(clients: int, sales_per_client: int, payments_per_sale: int) -> None:
+    Base.metadata.create_all(engine)
+    sales = clients * sales_per_client
+    start = date(2024, 1, 1)
+    with Session(engine) as db:
+        db.add(entities.Project(name="Bench", location="Bench"))
+        db.execute(insert(entities.Client), [{"full_name": f"Client {n}", "national_id": f"ID{n}"} for n in range(clients)])
+        db.execute(
+            insert(entities.Stand),
+            [
+                {"project_id": 1, "stand_number": f"S{n}", "size_m2": 500, "price": 25000, "status": entities.StandStatus.SOLD}
+                for n in range(sales)
+            ],
+        )
+        db.execute(
+            insert(entities.Sale),
+            [
+                {
+                    "stand_id": n + 1,
+                    "client_id": n // sales_per_client + 1,
+                    "sale_date": start,
+                    "sale_price": 25000,
+                    "status": entities.SaleStatus.ACTIVE,
+                }
+                for n in range(sales)
+            ],
+        )
+        db.execute(
+            insert(entities.PaymentPlan),
+            [
+                {
+                    "sale_id": n + 1,
+                    "total_due": 25000,
+                    "deposit_due": 2500,
+                    "installment_amount": 1000,
+                    "frequency": "monthly",
+                    "start_date": start,
+                    "end_date": start + timedelta(days=700),
+                    "status": "ACTIVE",
+                }
+                for n in range(sales)
+            ],
+        )
+        db.execute(
+            insert(entities.Payment),
+            [
+                {"sale_id": n + 1, "amount": 1000, "date": start + timedelta(days=14 * p), "method": "bank", "reference": f"R{n}-{p}"}
+                for n in range(sales)
+                for p in range(payments_per_sale)
+            ],
+        )
+        db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=10000)
+    parser.add_argument("--sales-per-client", type=int, default=2)
+    parser.add_argument("--payments-per-sale", type=int, default=10)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--processes", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+    seed(args.clients, args.sales_per_client, args.payments_per_sale)
+    print(f"{os.cpu_count()} cores; {args.clients} clients")
+    # "parent cpu" is the serial share left on the job thread (id scan, tar writes); the rest runs in the pool.
+    print(f"{'processes':>10}{'seconds':>10}{'per second':>12}{'speedup':>9}{'parent cpu':>12}")
+    baseline = None
+    for processes in args.processes:
+        path = os.path.join(os.path.dirname(DATABASE_PATH), f"statements-{processes}.tar")
+        with Session(engine) as db:
+            started, parent_started = time.perf_counter(), time.process_time()
+            done = generate_statements(db, path, PERIOD_END, processes, args.chunk_size)
+            elapsed, parent_cpu = time.perf_counter() - started, time.process_time() - parent_started
+        baseline = baseline or elapsed
+        print(f"{processes:>10}{elapsed:>10.2f}{done / elapsed:>12.0f}{baseline / elapsed:>8.2f}x{parent_cpu:>11.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -28,19 +28,32 @@ const ApprovalsPage = () => {
     onSuccess: () => queryClient.invalidateQueries()
   })
 
+  const batch = useMutation({
+    mutationFn: ({ action, ids }: { action: 'approve' | 'reject'; ids: number[] }) =>
+      api.post(`/reservations/batch/${action}`, { ids }),
+    onSuccess: () => queryClient.invalidateQueries()
+  })
+
+  const pending = reservations?.filter((r) => r.status === 'PENDING') ?? []
+  const pendingIds = pending.map((r) => r.id)
+
   return (
     <div className="card">
       <h2>Pending Approvals</h2>
+      <button disabled={!pendingIds.length} onClick={() => batch.mutate({ action: 'approve', ids: pendingIds })}>
+        Approve all
+      </button>
+      <button disabled={!pendingIds.length} onClick={() => batch.mutate({ action: 'reject', ids: pendingIds })}>
+        Reject all
+      </button>
       <ul>
-        {reservations
-          ?.filter((r) => r.status === 'PENDING')
-          .map((r) => (
-            <li key={r.id}>
-              Stand {r.stand_id} / Client {r.client_id}
-              <button onClick={() => approve.mutate(r.id)}>Approve</button>
-              <button onClick={() => reject.mutate(r.id)}>Reject</button>
-            </li>
-          ))}
+        {pending.map((r) => (
+          <li key={r.id}>
+            Stand {r.stand_id} / Client {r.client_id}
+            <button onClick={() => approve.mutate(r.id)}>Approve</button>
+            <button onClick={() => reject.mutate(r.id)}>Reject</button>
+          </li>
+        ))}
       </ul>
     </div>
   )
@@ -6,9 +6,10 @@ interface Reservation { status: string }
 interface Sale { status: string }
 
 const DashboardPage = () => {
-  const { data: stands } = useQuery({ queryKey: ['stands'], queryFn: async () => (await api.get<Stand[]>('/stands')).data })
-  const { data: reservations } = useQuery({ queryKey: ['reservations'], queryFn: async () => (await api.get<Reservation[]>('/reservations')).data })
-  const { data: sales } = useQuery({ queryKey: ['sales'], queryFn: async () => (await api.get<Sale[]>('/sales')).data })
+  const statusOnly = { params: { fields: 'status' } }
+  const { data: stands } = useQuery({ queryKey: ['stands', 'status'], queryFn: async () => (await api.get<Stand[]>('/stands', statusOnly)).data })
+  const { data: reservations } = useQuery({ queryKey: ['reservations', 'status'], queryFn: async () => (await api.get<Reservation[]>('/reservations', statusOnly)).data })
+  const { data: sales } = useQuery({ queryKey: ['sales', 'status'], queryFn: async () => (await api.get<Sale[]>('/sales', statusOnly)).data })
 
   const stats = {
     available: stands?.filter((s) => s.status === 'AVAILABLE').length ?? 0,